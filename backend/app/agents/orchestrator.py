@@ -79,7 +79,7 @@ class AgentOrchestrator(LoggerMixin):
                 "scene_description": scene_description,
                 "genre": genre,
                 "frame_count": frame_count,
-                "base_params": base_params.dict() if base_params else {},
+                "base_params": base_params.model_dump() if base_params else {},
                 "start_time": start_time,
                 "steps_completed": 0,
                 "total_steps": 4,
@@ -112,7 +112,7 @@ class AgentOrchestrator(LoggerMixin):
             structuring_result = await self.json_agent.process({
                 "shots": breakdown_result["shots"],
                 "genre": genre.value,
-                "base_params": base_params.dict() if base_params else {},
+                "base_params": base_params.model_dump() if base_params else {},
                 "consistency_requirements": {}
             })
             
@@ -366,10 +366,11 @@ class AgentOrchestrator(LoggerMixin):
             ("refinement", self.refinement_agent),
         ]
         
-        for name, agent in agents:
+        from langchain_core.messages import HumanMessage
+        
+        async def _check(name: str, agent: BaseAgent) -> None:
             try:
                 # Simple test to verify agent is responsive
-                from langchain_core.messages import HumanMessage
                 test_result = await agent._invoke_llm([
                     HumanMessage(content="Health check - respond with 'OK'")
                 ])
@@ -378,7 +379,10 @@ class AgentOrchestrator(LoggerMixin):
                 self.logger.error(f"Agent {name} health check failed", error=str(e))
                 health_status[name] = False
         
-        return health_status
+        # The probes are independent LLM round-trips
+        await asyncio.gather(*(_check(name, agent) for name, agent in agents))
+        
+        return {name: health_status[name] for name, _ in agents}
     
     def get_workflow_state(self) -> Dict[str, Any]:
         """Get current workflow state."""
@@ -7,17 +7,21 @@ from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.exceptions import AgentError, BriaAPIError, GenerationError
 from app.core.logging import get_logger
 from app.database import get_db
-from app.models.schemas import FrameParams, Genre
+from app.models.schemas import FrameParams, FrameParamsPatch
 from app.models.database import GenerationJob, Project, Frame
 from app.models.schemas import GenerationStatus
 from app.models.schemas import (
+    EXPORT_OPTIONS_BY_FORMAT,
+    GENRE_BY_VALUE,
+    PROJECT_FRAME_FIELDS,
     ErrorResponse,
     GenerationJob as GenerationJobSchema,
     GenerationProgress,
@@ -30,6 +34,9 @@ from datetime import datetime
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Upper bound on suggestions per /surprise-me request
+MAX_SURPRISE_SUGGESTIONS = 8
+
 
 @router.post(
     "/generate",
@@ -74,7 +81,7 @@ async def generate_scene(
             project_id=project_id,
             scene_description=request.scene_description,
             frame_count=request.frame_count or settings.DEFAULT_FRAME_COUNT,
-            base_params=request.base_params.dict() if request.base_params else {},
+            base_params=request.base_params.model_dump() if request.base_params else {},
         )
         db.add(job)
         db.commit()
@@ -146,19 +153,7 @@ async def generate_scene(
             frame_count=request.frame_count,
         )
         
-        # Manually create response to avoid serialization issues
-        return {
-            "id": job.id,
-            "project_id": job.project_id,
-            "status": job.status.value,
-            "progress_step": job.progress_step or 0,
-            "progress_total": job.progress_total or 1,
-            "progress_message": job.progress_message,
-            "created_at": job.created_at.isoformat(),
-            "started_at": job.started_at.isoformat() if job.started_at else None,
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "error_message": job.error_message,
-        }
+        return GenerationJobSchema.model_validate(job)
         
     except Exception as e:
         logger.error("Failed to start generation job", error=str(e))
@@ -187,7 +182,12 @@ async def get_generation_job(
             detail="Generation job not found",
         )
     
-    return GenerationJobSchema.from_orm(job)
+    # Polled by the client while a job runs: serialize once in pydantic-core
+    # instead of letting FastAPI re-validate against response_model.
+    return Response(
+        content=GenerationJobSchema.model_validate(job).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -284,7 +284,10 @@ async def refine_storyboard(
             project_id=project.id,
             scene_description=f"Refinement: {request.refinement_prompt}",
             frame_count=1,  # Single frame refinement
-            base_params=request.params.dict() if request.params else frame.params,
+            base_params={
+                **(frame.params or {}),
+                **(request.params.model_dump(exclude_none=True) if request.params else {}),
+            },
         )
         db.add(job)
         db.commit()
@@ -323,19 +326,7 @@ async def refine_storyboard(
             refinement_length=len(request.refinement_prompt),
         )
         
-        # Manually create response to avoid serialization issues
-        return {
-            "id": job.id,
-            "project_id": job.project_id,
-            "status": job.status.value,
-            "progress_step": job.progress_step or 0,
-            "progress_total": job.progress_total or 1,
-            "progress_message": job.progress_message,
-            "created_at": job.created_at.isoformat(),
-            "started_at": job.started_at.isoformat() if job.started_at else None,
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "error_message": job.error_message,
-        }
+        return GenerationJobSchema.model_validate(job)
         
     except HTTPException:
         raise
@@ -365,23 +356,10 @@ async def get_project(
             detail="Project not found",
         )
     
-    # Query frames separately to ensure they're loaded properly
-    frames = db.query(Frame).filter(Frame.project_id == project_id).order_by(Frame.sequence_number).all()
+    # Frames are eager-loaded in sequence order alongside the project
+    frames = project.frames
     
-    # Manually construct the response to avoid Pydantic issues
-    frames_data = []
-    for frame in frames:
-        # Ensure params is properly serialized
-        params = frame.params if frame.params else {}
-        frames_data.append({
-            "id": frame.id,
-            "image_url": frame.image_url,
-            "prompt": frame.prompt,
-            "params": params,
-            "created_at": frame.created_at.isoformat(),
-            "notes": frame.notes,
-            "sequence_number": frame.sequence_number
-        })
+    frames_data = _serialize_frames(frames)
     
     return {
         "id": project.id,
@@ -411,8 +389,28 @@ async def surprise_me(
         
         surprise_service = SurpriseService()
         
+        # The body is untyped; anything but a string falls back to the default
         current_genre = request.get("current_genre", "noir")
+        if not isinstance(current_genre, str):
+            current_genre = "noir"
         style_preference = request.get("style_preference", "cinematic")
+        if not isinstance(style_preference, str):
+            style_preference = "cinematic"
+        count = request.get("count", 1)
+        
+        # Several options at once are generated concurrently
+        if isinstance(count, int) and count > 1:
+            suggestions = await surprise_service.generate_creative_scenes(
+                min(count, MAX_SURPRISE_SUGGESTIONS),
+                current_genre=current_genre,
+                style_preference=style_preference
+            )
+            logger.info(
+                "Creative scene suggestions generated",
+                genre=current_genre,
+                count=len(suggestions),
+            )
+            return {"suggestions": suggestions}
         
         # Generate creative suggestion using Gemini
         suggestion = await surprise_service.generate_creative_scene(
@@ -487,7 +485,7 @@ async def export_project(
             )
         
         # Get frames
-        frames = db.query(Frame).filter(Frame.project_id == project_id).order_by(Frame.sequence_number).all()
+        frames = project.frames
         if not frames:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -496,7 +494,17 @@ async def export_project(
         
         export_service = ExportService()
         export_format = request.get("format", "json")
-        export_options = request.get("options", {})
+        export_options = request.get("options") or {}
+        
+        options_model = EXPORT_OPTIONS_BY_FORMAT.get(export_format)
+        if options_model is not None:
+            try:
+                export_options = options_model.model_validate(export_options).model_dump()
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Invalid {export_format} export options: {e}",
+                )
         
         # Generate export
         export_result = await export_service.export_project(
@@ -506,6 +514,23 @@ async def export_project(
             options=export_options
         )
         
+        headers = {
+            "Content-Disposition": f"attachment; filename={export_result['filename']}"
+        }
+        
+        # Archives are streamed as they are built
+        if "stream" in export_result:
+            logger.info(
+                "Project export streaming",
+                project_id=project_id,
+                format=export_format
+            )
+            return StreamingResponse(
+                export_result["stream"],
+                media_type=export_result["media_type"],
+                headers=headers
+            )
+        
         logger.info(
             "Project exported successfully",
             project_id=project_id,
@@ -514,14 +539,10 @@ async def export_project(
         )
         
         # Return file response
-        from fastapi.responses import Response
-        
         return Response(
             content=export_result["content"],
             media_type=export_result["media_type"],
-            headers={
-                "Content-Disposition": f"attachment; filename={export_result['filename']}"
-            }
+            headers=headers
         )
         
     except HTTPException:
@@ -653,21 +674,9 @@ async def get_shared_project(
             )
         
         # Get frames
-        frames = db.query(Frame).filter(Frame.project_id == project.id).order_by(Frame.sequence_number).all()
-        
-        # Build response
-        frames_data = []
-        for frame in frames:
-            params = frame.params if frame.params else {}
-            frames_data.append({
-                "id": frame.id,
-                "image_url": frame.image_url,
-                "prompt": frame.prompt,
-                "params": params,
-                "created_at": frame.created_at.isoformat(),
-                "notes": frame.notes,
-                "sequence_number": frame.sequence_number
-            })
+        frames = project.frames
+        
+        frames_data = _serialize_frames(frames)
         
         logger.info(
             "Shared project accessed",
@@ -736,6 +745,18 @@ async def cancel_generation_job(
 
 # Background task functions
 
+def _serialize_frames(frames: List[Frame]) -> List[Dict[str, Any]]:
+    """Read stored frames into the ProjectFrame wire shape.
+    
+    Rows come from our own database and were validated on write, so they
+    skip pydantic validation; datetimes are encoded by the response layer.
+    """
+    return [
+        {name: getattr(frame, name) for name in PROJECT_FRAME_FIELDS}
+        for frame in frames
+    ]
+
+
 async def _run_generation_job(job_id: str, request_data: Dict[str, Any]) -> None:
     """Run generation job in background."""
     from app.database import SessionLocal
@@ -766,7 +787,7 @@ async def _run_generation_job(job_id: str, request_data: Dict[str, Any]) -> None
         # Run generation
         result = await generation_service.generate_storyboard(
             scene_description=request_data["scene_description"],
-            genre=Genre(request_data["genre"]),
+            genre=GENRE_BY_VALUE[request_data["genre"]],
             frame_count=request_data.get("frame_count", 6),
             base_params=FrameParams(**request_data.get("base_params", {})),
             progress_callback=progress_callback,
@@ -834,7 +855,7 @@ async def _run_refinement_job(
         refined_frame = await generation_service.refine_frame(
             frame_id=frame_id,
             refinement_prompt=refinement_prompt,
-            params=FrameParams(**params) if params else None,
+            params=FrameParamsPatch(**params) if params else None,
         )
         
         # Update job completion
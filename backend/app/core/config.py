@@ -7,6 +7,7 @@ import os
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+import orjson
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 
@@ -35,10 +36,9 @@ class Settings(BaseSettings):
     def parse_cors_origins(cls, v):
         """Parse CORS origins from string or list."""
         if isinstance(v, str):
-            import json
             try:
-                return json.loads(v)
-            except json.JSONDecodeError:
+                return orjson.loads(v)
+            except orjson.JSONDecodeError:
                 # If not valid JSON, treat as single origin
                 return [v]
         return v
@@ -53,13 +53,18 @@ class Settings(BaseSettings):
         env="BRIA_BASE_URL"
     )
     BRIA_API_VERSION: str = Field(default="v2", env="BRIA_API_VERSION")
+    BRIA_MAX_CONCURRENCY: int = Field(default=6, env="BRIA_MAX_CONCURRENCY")
     
     # Google Gemini Configuration (for agents)
     GOOGLE_API_KEY: str = Field(default="", env="GOOGLE_API_KEY")
     GEMINI_MODEL: str = Field(default="gemini-1.5-flash-latest", env="GEMINI_MODEL")
+    GEMINI_MAX_CONCURRENCY: int = Field(default=16, env="GEMINI_MAX_CONCURRENCY")
+    GEMINI_REQUESTS_PER_MINUTE: int = Field(default=60, env="GEMINI_REQUESTS_PER_MINUTE")
     
     # File Storage
     UPLOAD_DIR: str = Field(default="./uploads", env="UPLOAD_DIR")
+    EXPORT_CACHE_DIR: str = Field(default="./export_cache", env="EXPORT_CACHE_DIR")
+    EXPORT_CACHE_MAX_ENTRIES: int = Field(default=32, env="EXPORT_CACHE_MAX_ENTRIES")
     MAX_FILE_SIZE: int = Field(default=50 * 1024 * 1024, env="MAX_FILE_SIZE")  # 50MB
     
     # Monitoring
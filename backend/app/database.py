@@ -2,6 +2,7 @@
 Database configuration and session management.
 """
 
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -11,11 +12,19 @@ from app.core.config import settings
 from app.models.database import Base
 
 
+def _json_serializer(value: object) -> str:
+    """Serialize a JSON column value; non-string keys are stringified like json.dumps."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 engine = create_engine(
     settings.DATABASE_URL,
     poolclass=StaticPool if settings.DATABASE_URL.startswith("sqlite") else None,
     connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
     echo=settings.DEBUG,
+    # JSON columns (frame params, job options) go through orjson
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 
@@ -3,16 +3,21 @@ SceneForge Backend - Main FastAPI application.
 Production-ready backend for agentic pre-visualization pipeline.
 """
 
+import importlib
+import logging
 import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, Optional
 
+import orjson
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, Response
+from starlette.datastructures import URL
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.api.v1.endpoints import generation
 from app.core.config import settings
 from app.core.exceptions import SceneForgeException
 from app.core.logging import configure_logging, get_logger
@@ -22,6 +27,13 @@ from app.models.schemas import ErrorResponse, HealthCheck
 
 configure_logging()
 logger = get_logger(__name__)
+_log_enabled = logging.getLogger(__name__).isEnabledFor
+
+# Served under /uploads; created when the app starts
+_UPLOAD_DIR = Path(settings.UPLOAD_DIR).resolve()
+
+# How long shutdown waits for background image copies before cancelling them
+_SHUTDOWN_DRAIN_TIMEOUT = 10.0
 
 
 
@@ -40,12 +52,95 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to create database tables", error=str(e))
         raise
     
+    _UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Mounting uploads directory: {_UPLOAD_DIR}")
+    _warm_service_modules()
+    
+    from app.services.bria_client import close_bria_client, get_bria_client
+    from app.services.export_service import probe_hw_h264_encoder
+    from app.services.generation_service import drain_background_tasks
+    from app.services.storage_service import close_storage_client
+    
+    # The ffmpeg encoder probe is a subprocess; run it before the first export
+    await probe_hw_h264_encoder()
+    
+    # One Bria connection pool for the life of the process, shared by the
+    # handlers through get_bria_client and closed on shutdown
+    get_bria_client()
+    
     yield
     
     
     logger.info("Shutting down SceneForge backend")
+    # Background tasks still use the shared clients, so they finish first
+    await drain_background_tasks(_SHUTDOWN_DRAIN_TIMEOUT)
+    await close_bria_client()
+    await close_storage_client()
 
 
+def _register_routes(app: FastAPI) -> None:
+    """Include API routers and static mounts.
+    
+    Runs when the app is built, so routes exist even without the lifespan
+    (e.g. TestClient used without ``with``). Service modules stay imported
+    lazily by the handlers, and the OpenAPI document is rendered on first
+    request.
+    """
+    from fastapi.staticfiles import StaticFiles
+    
+    from app.api.v1.endpoints.generation import router as generation_router
+    
+    app.include_router(
+        generation_router,
+        prefix=f"{settings.API_V1_STR}/generation",
+        tags=["generation"],
+    )
+    
+    # The directory itself is created at startup, not as an import side effect
+    app.mount(
+        "/uploads",
+        StaticFiles(directory=str(_UPLOAD_DIR), check_dir=False),
+        name="uploads",
+    )
+    
+    if app.openapi_url:
+        _cache_openapi(app)
+
+
+def _cache_openapi(app: FastAPI) -> None:
+    """Render the OpenAPI document on first request and serve the encoded bytes."""
+    openapi_bytes: Optional[bytes] = None
+    
+    async def openapi(request: Request) -> Response:
+        nonlocal openapi_bytes
+        if openapi_bytes is None:
+            openapi_bytes = orjson.dumps(app.openapi())
+        return Response(content=openapi_bytes, media_type="application/json")
+    
+    # Ahead of FastAPI's own handler, which re-encodes the dict per request
+    app.router.routes.insert(
+        0, Route(app.openapi_url, openapi, include_in_schema=False)
+    )
+
+
+# Imported lazily inside the generation handlers; loading them here moves
+# the import and pydantic schema build cost off the first request.
+_WARM_MODULES = (
+    "app.services.generation_service",
+    "app.services.export_service",
+    "app.services.surprise_service",
+)
+
+
+def _warm_service_modules() -> None:
+    """Import handler-level service modules once during startup."""
+    for name in _WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            # Leave the failure to surface on the request that needs it
+            logger.warning("Failed to preload module", module=name, error=str(e))
+
 
 app = FastAPI(
     title="SceneForge Backend",
@@ -53,8 +148,10 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
+_register_routes(app)
 
 
 app.add_middleware(
@@ -68,32 +165,50 @@ app.add_middleware(
 
 
 
-@app.middleware("http")
-async def logging_middleware(request: Request, call_next):
-    """Log requests and responses."""
-    start_time = time.time()
+class LoggingMiddleware:
+    """Log requests and responses (pure ASGI, no Request object per hit)."""
     
-   
-    logger.info(
-        "Request started",
-        method=request.method,
-        url=str(request.url),
-        client_ip=request.client.host if request.client else None,
-    )
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
     
-    response = await call_next(request)
-    
-    
-    duration = time.time() - start_time
-    logger.info(
-        "Request completed",
-        method=request.method,
-        url=str(request.url),
-        status_code=response.status_code,
-        duration=duration,
-    )
-    
-    return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip building log fields entirely when INFO is filtered out
+        if scope["type"] != "http" or not _log_enabled(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        method = scope["method"]
+        url = str(URL(scope=scope))
+        client = scope.get("client")
+        
+        logger.info(
+            "Request started",
+            method=method,
+            url=url,
+            client_ip=client[0] if client else None,
+        )
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+        
+        logger.info(
+            "Request completed",
+            method=method,
+            url=url,
+            status_code=status_code,
+            duration=time.perf_counter() - start_time,
+        )
+
+
+app.add_middleware(LoggingMiddleware)
 
 
 
@@ -108,13 +223,15 @@ async def sceneforge_exception_handler(request: Request, exc: SceneForgeExceptio
         url=str(request.url),
     )
     
-    return JSONResponse(
+    # Serialized straight to bytes by pydantic-core
+    return Response(
         status_code=status.HTTP_400_BAD_REQUEST,
+        media_type="application/json",
         content=ErrorResponse(
             error=exc.error_code or "SceneForgeError",
             message=exc.message,
             details=exc.details,
-        ).dict(),
+        ).model_dump_json(),
     )
 
 
@@ -128,12 +245,13 @@ async def general_exception_handler(request: Request, exc: Exception):
         exc_info=True,
     )
     
-    return JSONResponse(
+    return Response(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        media_type="application/json",
         content=ErrorResponse(
             error="InternalServerError",
             message="An internal server error occurred",
-        ).dict(),
+        ).model_dump_json(),
     )
 
 
@@ -144,7 +262,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     summary="Health check",
     description="Check service health and status",
 )
-async def health_check() -> HealthCheck:
+async def health_check() -> Response:
     """Health check endpoint."""
     
     services = {}
@@ -189,35 +307,17 @@ async def health_check() -> HealthCheck:
     except Exception:
         services["storage"] = "error"
     
-    return HealthCheck(
-        version=settings.APP_VERSION,
-        services=services,
+    # Hit by container health probes; skip response_model re-validation
+    return Response(
+        content=HealthCheck(
+            version=settings.APP_VERSION,
+            services=services,
+        ).model_dump_json(),
+        media_type="application/json",
     )
 
 
 
-
-
-
-app.include_router(
-    generation.router,
-    prefix=f"{settings.API_V1_STR}/generation",
-    tags=["generation"],
-)
-
-
-import os
-from pathlib import Path
-
-
-upload_dir = Path(settings.UPLOAD_DIR).resolve()
-upload_dir.mkdir(parents=True, exist_ok=True)
-
-logger.info(f"Mounting uploads directory: {upload_dir}")
-app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
-
-
-
 @app.get(
     "/",
     summary="API Information",
@@ -3,7 +3,8 @@ SQLAlchemy database models for SceneForge.
 Production-ready database schema with proper relationships and indexes.
 """
 
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from sqlalchemy import (
@@ -17,27 +18,37 @@ from sqlalchemy import (
     String,
     Text,
     Index,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped
-from sqlalchemy.sql import func
 
 from app.models.schemas import GenerationStatus, Genre
 
 Base = declarative_base()
 
 
+def _new_uuid() -> str:
+    """Generate a primary key for UUID columns."""
+    return str(uuid.uuid4())
+
+
+def _utcnow() -> datetime:
+    """Current UTC time for timestamp defaults."""
+    return datetime.now(timezone.utc)
+
+
 class TimestampMixin:
     """Mixin for timestamp fields."""
     created_at: Mapped[datetime] = Column(
         DateTime(timezone=True), 
-        server_default=func.now(),
+        default=_utcnow,
         nullable=False
     )
     updated_at: Mapped[datetime] = Column(
         DateTime(timezone=True), 
-        server_default=func.now(),
-        onupdate=func.now(),
+        default=_utcnow,
+        onupdate=_utcnow,
         nullable=False
     )
 
@@ -46,7 +57,7 @@ class Project(Base, TimestampMixin):
     """Scene project database model."""
     __tablename__ = "projects"
     
-    id: Mapped[str] = Column(String(36), primary_key=True)
+    id: Mapped[str] = Column(String(36), primary_key=True, default=_new_uuid)
     name: Mapped[str] = Column(String(100), nullable=False)
     description: Mapped[str] = Column(Text, nullable=False)
     genre: Mapped[Genre] = Column(Enum(Genre), nullable=False)
@@ -64,12 +75,16 @@ class Project(Base, TimestampMixin):
         "Frame", 
         back_populates="project",
         cascade="all, delete-orphan",
-        order_by="Frame.sequence_number"
+        order_by="Frame.sequence_number",
+        lazy="selectin"
     )
+    # Never implicitly loaded; query jobs explicitly to avoid N+1 access
     generation_jobs: Mapped[List["GenerationJob"]] = relationship(
         "GenerationJob",
         back_populates="project",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
     )
     
     # Indexes
@@ -85,9 +100,9 @@ class Frame(Base, TimestampMixin):
     """Frame database model."""
     __tablename__ = "frames"
     
-    id: Mapped[str] = Column(String(36), primary_key=True)
+    id: Mapped[str] = Column(String(36), primary_key=True)  # agent-assigned, not a UUID
     project_id: Mapped[str] = Column(
-        String(36), 
+        String(36),
         ForeignKey("projects.id", ondelete="CASCADE"),
         nullable=False
     )
@@ -121,7 +136,7 @@ class GenerationJob(Base, TimestampMixin):
     """Background generation job model."""
     __tablename__ = "generation_jobs"
     
-    id: Mapped[str] = Column(String(36), primary_key=True)
+    id: Mapped[str] = Column(String(36), primary_key=True, default=_new_uuid)
     project_id: Mapped[str] = Column(
         String(36),
         ForeignKey("projects.id", ondelete="CASCADE"),
@@ -166,7 +181,7 @@ class ExportJob(Base, TimestampMixin):
     """Export job model."""
     __tablename__ = "export_jobs"
     
-    id: Mapped[str] = Column(String(36), primary_key=True)
+    id: Mapped[str] = Column(String(36), primary_key=True, default=_new_uuid)
     project_id: Mapped[str] = Column(
         String(36),
         ForeignKey("projects.id", ondelete="CASCADE"),
@@ -203,7 +218,7 @@ class APIKey(Base, TimestampMixin):
     """API key model for authentication."""
     __tablename__ = "api_keys"
     
-    id: Mapped[str] = Column(String(36), primary_key=True)
+    id: Mapped[str] = Column(String(36), primary_key=True, default=_new_uuid)
     key_hash: Mapped[str] = Column(String(128), nullable=False, unique=True)
     name: Mapped[str] = Column(String(100), nullable=False)
     
@@ -222,7 +237,13 @@ class APIKey(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_api_keys_key_hash", "key_hash"),
         Index("ix_api_keys_user_id", "user_id"),
-        Index("ix_api_keys_is_active", "is_active"),
+        # Partial index: lookups only ever target active keys
+        Index(
+            "ix_api_keys_active_hash",
+            "key_hash",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
     )
 
 
@@ -231,7 +252,7 @@ class ShareLink(Base, TimestampMixin):
     """Share link model for project sharing."""
     __tablename__ = "share_links"
     
-    id: Mapped[str] = Column(String(36), primary_key=True)
+    id: Mapped[str] = Column(String(36), primary_key=True, default=_new_uuid)
     project_id: Mapped[str] = Column(
         String(36),
         ForeignKey("projects.id", ondelete="CASCADE"),
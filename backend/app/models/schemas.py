@@ -3,11 +3,65 @@ Pydantic schemas for SceneForge API.
 Production-ready data validation and serialization.
 """
 
-from datetime import datetime
+from copy import copy
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Annotated, Any, Callable, Dict, Final, List, Literal, Mapping, Optional, Tuple, Type, Union, get_args
 
-from pydantic import BaseModel, Field, validator
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    create_model,
+)
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now for response timestamps."""
+    return datetime.now(timezone.utc)
+
+
+def _field_descriptions(**descriptions: str) -> Callable[[Dict[str, Any]], None]:
+    """Attach field descriptions when the JSON schema is generated.
+    
+    Keeps the docs in OpenAPI without storing them on each FieldInfo of
+    the request models validated on every call.
+    """
+    def apply(schema: Dict[str, Any]) -> None:
+        for name, prop in schema.get("properties", {}).items():
+            if name in descriptions:
+                prop["description"] = descriptions[name]
+    
+    return apply
+
+
+def _partial(
+    model: Type[BaseModel], name: str, doc: str, **overrides: Any
+) -> Type[BaseModel]:
+    """Derive a patch model with every field optional, keeping constraints.
+    
+    ``overrides`` swaps the annotation of named fields, e.g. to nest another
+    patch model instead of the full one.
+    """
+    fields: Dict[str, Any] = {}
+    for field_name, field in model.model_fields.items():
+        info = copy(field)
+        info.default = None
+        info.default_factory = None
+        annotation = overrides.get(field_name, field.annotation)
+        fields[field_name] = (Optional[annotation], info)
+    return create_model(
+        name,
+        __config__=ConfigDict(
+            json_schema_extra=model.model_config.get("json_schema_extra"),
+        ),
+        __doc__=doc,
+        __module__=__name__,
+        **fields,
+    )
 
 
 class CameraAngle(str, Enum):
@@ -33,6 +87,31 @@ class Composition(str, Enum):
     GOLDEN_RATIO = "golden-ratio"
 
 
+# Literal mirrors of the enums above for hot schema fields: pydantic-core
+# validates a Literal as a plain string-set lookup, no Enum construction.
+CameraAngleValue = Literal[
+    "eye-level",
+    "low-angle",
+    "high-angle",
+    "dutch-angle",
+    "birds-eye",
+    "worms-eye",
+    "over-shoulder",
+    "pov",
+]
+CompositionValue = Literal[
+    "rule-of-thirds",
+    "centered",
+    "symmetrical",
+    "leading-lines",
+    "frame-within-frame",
+    "negative-space",
+    "golden-ratio",
+]
+CAMERA_ANGLES: Final[Tuple[str, ...]] = get_args(CameraAngleValue)
+COMPOSITIONS: Final[Tuple[str, ...]] = get_args(CompositionValue)
+
+
 class Genre(str, Enum):
     """Film genre options."""
     NOIR = "noir"
@@ -56,27 +135,48 @@ class GenerationStatus(str, Enum):
 
 class FrameParams(BaseModel):
     """Frame generation parameters."""
-    fov: int = Field(default=50, ge=10, le=120, description="Field of view in degrees")
-    lighting: int = Field(default=60, ge=0, le=100, description="Lighting intensity")
-    hdr_bloom: int = Field(default=30, ge=0, le=100, description="HDR bloom intensity")
-    color_temp: int = Field(default=5500, ge=2000, le=10000, description="Color temperature in Kelvin")
-    contrast: int = Field(default=50, ge=0, le=100, description="Contrast level")
-    camera_angle: CameraAngle = Field(default=CameraAngle.EYE_LEVEL, description="Camera angle")
-    composition: Composition = Field(default=Composition.RULE_OF_THIRDS, description="Composition rule")
+    fov: int = Field(default=50, ge=10, le=120)
+    lighting: int = Field(default=60, ge=0, le=100)
+    hdr_bloom: int = Field(default=30, ge=0, le=100)
+    color_temp: int = Field(default=5500, ge=2000, le=10000)
+    contrast: int = Field(default=50, ge=0, le=100)
+    camera_angle: CameraAngleValue = Field(default=CameraAngle.EYE_LEVEL.value)
+    composition: CompositionValue = Field(default=Composition.RULE_OF_THIRDS.value)
+    
+    # Agent output may carry extra keys (shot_type, ...), so extras stay ignored
+    model_config = ConfigDict(
+        frozen=True,
+        revalidate_instances="never",
+        json_schema_extra=_field_descriptions(
+            fov="Field of view in degrees",
+            lighting="Lighting intensity",
+            hdr_bloom="HDR bloom intensity",
+            color_temp="Color temperature in Kelvin",
+            contrast="Contrast level",
+            camera_angle="Camera angle",
+            composition="Composition rule",
+        ),
+    )
+
+
+FrameParamsPatch = _partial(
+    FrameParams, "FrameParamsPatch", "Partial frame parameter update."
+)
 
 
 class FrameCreate(BaseModel):
     """Frame creation request."""
-    prompt: str = Field(..., min_length=10, max_length=1000, description="Scene description")
+    prompt: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=10, max_length=1000),
+    ] = Field(..., description="Scene description")
     params: FrameParams = Field(default_factory=FrameParams, description="Generation parameters")
     notes: Optional[str] = Field(default=None, max_length=500, description="Optional notes")
 
 
-class FrameUpdate(BaseModel):
-    """Frame update request."""
-    prompt: Optional[str] = Field(default=None, min_length=10, max_length=1000)
-    params: Optional[FrameParams] = Field(default=None)
-    notes: Optional[str] = Field(default=None, max_length=500)
+FrameUpdate = _partial(
+    FrameCreate, "FrameUpdate", "Frame update request.", params=FrameParamsPatch
+)
 
 
 class Frame(BaseModel):
@@ -88,48 +188,73 @@ class Frame(BaseModel):
     timestamp: datetime = Field(..., description="Creation timestamp")
     notes: Optional[str] = Field(default=None, description="Optional notes")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid",
+        frozen=True,
+        revalidate_instances="never",
+    )
+
+
+class ProjectFrame(BaseModel):
+    """Stored frame as returned inside project responses."""
+    id: str = Field(..., description="Unique frame identifier")
+    image_url: str = Field(..., description="Generated image URL")
+    prompt: str = Field(..., description="Scene description used")
+    params: Any = Field(default_factory=dict, description="Generation parameters used")
+    created_at: datetime = Field(..., description="Creation timestamp")
+    notes: Optional[str] = Field(default=None, description="Optional notes")
+    sequence_number: int = Field(..., description="Position in the storyboard")
+    
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid",
+        frozen=True,
+        revalidate_instances="never",
+    )
+
+
+# Wire field order for stored frames read back from our own database
+PROJECT_FRAME_FIELDS: Final[Tuple[str, ...]] = tuple(ProjectFrame.model_fields)
 
 
 class SceneGenerationRequest(BaseModel):
     """Scene generation request."""
-    scene_description: str = Field(
-        ..., 
-        min_length=20, 
-        max_length=2000, 
-        description="High-level scene description"
-    )
-    genre: Genre = Field(..., description="Film genre")
-    frame_count: Optional[int] = Field(
-        default=6, 
-        ge=1, 
-        le=20, 
-        description="Number of frames to generate"
-    )
-    base_params: Optional[FrameParams] = Field(
-        default_factory=FrameParams, 
-        description="Base parameters for all frames"
-    )
+    # Stripped and length-checked inside pydantic-core, no Python validator
+    scene_description: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=20, max_length=2000),
+    ]
+    genre: Genre
+    frame_count: Optional[int] = Field(default=6, ge=1, le=20)
+    base_params: Optional[FrameParams] = Field(default_factory=FrameParams)
     
-    @validator("scene_description")
-    def validate_scene_description(cls, v: str) -> str:
-        """Validate scene description content."""
-        if not v.strip():
-            raise ValueError("Scene description cannot be empty")
-        return v.strip()
+    model_config = ConfigDict(
+        json_schema_extra=_field_descriptions(
+            scene_description="High-level scene description",
+            genre="Film genre",
+            frame_count="Number of frames to generate",
+            base_params="Base parameters for all frames",
+        ),
+    )
 
 
 class SceneRefinementRequest(BaseModel):
     """Scene refinement request."""
-    frame_id: str = Field(..., description="Frame ID to refine")
-    refinement_prompt: str = Field(
-        ..., 
-        min_length=5, 
-        max_length=500, 
-        description="Refinement instructions"
+    frame_id: str
+    refinement_prompt: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=5, max_length=500),
+    ]
+    params: Optional[FrameParamsPatch] = None
+    
+    model_config = ConfigDict(
+        json_schema_extra=_field_descriptions(
+            frame_id="Frame ID to refine",
+            refinement_prompt="Refinement instructions",
+            params="Updated parameters",
+        ),
     )
-    params: Optional[FrameParams] = Field(default=None, description="Updated parameters")
 
 
 class GenerationProgress(BaseModel):
@@ -155,8 +280,12 @@ class SceneProject(BaseModel):
     updated_at: datetime = Field(..., description="Last update timestamp")
     status: GenerationStatus = Field(default=GenerationStatus.PENDING, description="Project status")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid",
+        frozen=True,
+        revalidate_instances="never",
+    )
 
 
 class SceneProjectCreate(BaseModel):
@@ -166,11 +295,14 @@ class SceneProjectCreate(BaseModel):
     genre: Genre = Field(..., description="Film genre")
 
 
-class SceneProjectUpdate(BaseModel):
-    """Scene project update request."""
-    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
-    description: Optional[str] = Field(default=None, min_length=1, max_length=1000)
-    genre: Optional[Genre] = Field(default=None)
+SceneProjectUpdate = _partial(
+    SceneProjectCreate, "SceneProjectUpdate", "Scene project update request."
+)
+
+
+# ORM progress columns may be NULL (or 0 for an unstarted total)
+ProgressStep = Annotated[int, BeforeValidator(lambda v: v or 0)]
+ProgressTotal = Annotated[int, BeforeValidator(lambda v: v or 1)]
 
 
 class GenerationJob(BaseModel):
@@ -178,36 +310,20 @@ class GenerationJob(BaseModel):
     id: str = Field(..., description="Unique job identifier")
     project_id: str = Field(..., description="Associated project ID")
     status: GenerationStatus = Field(..., description="Job status")
-    progress_step: int = Field(default=0, description="Current progress step")
-    progress_total: int = Field(default=1, description="Total progress steps")
+    progress_step: ProgressStep = Field(default=0, description="Current progress step")
+    progress_total: ProgressTotal = Field(default=1, description="Total progress steps")
     progress_message: Optional[str] = Field(default=None, description="Current progress message")
     created_at: datetime = Field(..., description="Job creation timestamp")
     started_at: Optional[datetime] = Field(default=None, description="Job start timestamp")
     completed_at: Optional[datetime] = Field(default=None, description="Job completion timestamp")
     error_message: Optional[str] = Field(default=None, description="Error message if failed")
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
-    
-    @classmethod
-    def from_orm(cls, obj):
-        """Custom from_orm to handle datetime serialization properly."""
-        data = {
-            "id": obj.id,
-            "project_id": obj.project_id,
-            "status": obj.status,
-            "progress_step": obj.progress_step or 0,
-            "progress_total": obj.progress_total or 1,
-            "progress_message": obj.progress_message,
-            "created_at": obj.created_at,
-            "started_at": obj.started_at,
-            "completed_at": obj.completed_at,
-            "error_message": obj.error_message,
-        }
-        return cls(**data)
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid",
+        frozen=True,
+        revalidate_instances="never",
+    )
 
 
 class ExportFormat(str, Enum):
@@ -220,11 +336,51 @@ class ExportFormat(str, Enum):
     COMFYUI_WORKFLOW = "comfyui"
 
 
+# Frozen value -> member table for converting trusted genre strings without
+# Enum.__call__; also serves as the set of valid genre values.
+GENRE_BY_VALUE: Final[Mapping[str, Genre]] = MappingProxyType(
+    {member.value: member for member in Genre}
+)
+
+
+class JsonExportOptions(BaseModel):
+    """Options for JSON project exports."""
+    include_metadata: bool = Field(default=True, description="Include export metadata")
+    compress: bool = Field(default=False, description="zstd-compress the export when zstandard is installed")
+
+
+class Mp4ExportOptions(BaseModel):
+    """Options for MP4 reel exports."""
+    fps: int = Field(default=2, ge=1, le=60, description="Output frame rate")
+    quality: Literal["high", "medium", "low"] = Field(default="high", description="Encoder quality tier")
+
+
+class ExrExportOptions(BaseModel):
+    """Options for EXR/PNG sequence exports."""
+
+
+class NukeExportOptions(BaseModel):
+    """Options for Nuke script exports."""
+    compress: bool = Field(default=False, description="zstd-compress the export when zstandard is installed")
+
+
+# Dispatch table from the export format string to its options model; the
+# format lives outside the options payload, so it acts as the union tag.
+EXPORT_OPTIONS_BY_FORMAT: Final[Dict[str, Type[BaseModel]]] = {
+    "json": JsonExportOptions,
+    ExportFormat.MP4.value: Mp4ExportOptions,
+    ExportFormat.EXR.value: ExrExportOptions,
+    ExportFormat.NUKE_SCRIPT.value: NukeExportOptions,
+}
+
+
 class ExportRequest(BaseModel):
     """Export request."""
     project_id: str = Field(..., description="Project ID to export")
     format: ExportFormat = Field(..., description="Export format")
-    options: Optional[Dict[str, Any]] = Field(
+    # Unused by the export route, which takes the project id from the path
+    # and validates options per format through EXPORT_OPTIONS_BY_FORMAT
+    options: Any = Field(
         default_factory=dict, 
         description="Format-specific options"
     )
@@ -242,23 +398,13 @@ class HealthCheck(BaseModel):
     """Health check response."""
     status: str = Field(default="healthy", description="Service status")
     version: str = Field(..., description="Application version")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Check timestamp")
+    timestamp: datetime = Field(default_factory=_utcnow, description="Check timestamp")
     services: Dict[str, str] = Field(default_factory=dict, description="Service statuses")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
 
 
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
-    details: Optional[Dict[str, Any]] = Field(default=None, description="Additional error details")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
\ No newline at end of file
+    details: Any = Field(default=None, description="Additional error details")
+    timestamp: datetime = Field(default_factory=_utcnow, description="Error timestamp")
\ No newline at end of file
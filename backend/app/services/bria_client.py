@@ -4,12 +4,24 @@ Production-ready client using V2 API with VLM Bridge and structured prompts.
 """
 
 import asyncio
-import json
+import re
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Deque, Dict, Final, List, Optional, Tuple, Union
 
 import httpx
+import orjson
 from pydantic import BaseModel
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from app.core.config import settings
 from app.core.exceptions import BriaAPIError
@@ -17,17 +29,32 @@ from app.core.logging import LoggerMixin
 from app.models.schemas import FrameParams
 
 
-class BriaV2GenerationRequest(BaseModel):
+@dataclass(slots=True)
+class BriaV2GenerationRequest:
     """Bria AI V2 generation request model."""
     prompt: str
     structured_prompt: Optional[str] = None
     aspect_ratio: Optional[str] = "16:9"
     images: Optional[List[str]] = None  # URLs or Base64 images for refinement
+    seed: Optional[int] = None  # Pinned seeds make results reproducible
     sync: bool = False  # V2 is async by default
+    
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON body for the generate endpoint, omitting unset fields."""
+        return {
+            name: value
+            for name in self.__slots__
+            if (value := getattr(self, name)) is not None
+        }
 
 
-class BriaV2StructuredPrompt(BaseModel):
-    """Bria V2 structured prompt following official API schema."""
+@dataclass(slots=True, frozen=True, kw_only=True)
+class BriaV2StructuredPrompt:
+    """Bria V2 structured prompt following official API schema.
+    
+    Documents the payload shape; _structured_prompt_json builds the same
+    keys as a plain dict since the outbound JSON needs no validation.
+    """
     short_description: str
     objects: List[Dict[str, Any]]
     background_setting: str
@@ -52,6 +79,221 @@ class BriaGenerationResponse(BaseModel):
     completed_at: Optional[str] = None
 
 
+# Map camera angles to descriptive terms
+_ANGLE_DESCRIPTIONS: Final[Dict[str, str]] = {
+    "eye-level": "at eye level, creating natural perspective",
+    "low-angle": "from a low angle, creating dramatic upward perspective", 
+    "high-angle": "from a high angle, providing overview perspective",
+    "dutch-angle": "with dutch tilt, creating dynamic diagonal composition",
+    "birds-eye": "from birds-eye view, aerial perspective",
+    "worms-eye": "from worms-eye view, extreme low angle",
+    "over-shoulder": "over-shoulder perspective",
+    "pov": "first-person point of view",
+}
+
+# Map composition rules
+_COMPOSITION_DESCRIPTIONS: Final[Dict[str, str]] = {
+    "rule-of-thirds": "using rule of thirds composition for balanced framing",
+    "centered": "with centered composition for symmetrical balance",
+    "symmetrical": "with symmetrical composition",
+    "leading-lines": "using leading lines to guide the eye",
+    "frame-within-frame": "with frame-within-frame technique",
+    "negative-space": "utilizing negative space for minimalist impact",
+    "golden-ratio": "following golden ratio proportions",
+}
+
+_SHORT_DESCRIPTION_TEMPLATE: Final = (
+    "A professional cinematographic shot {camera_desc}, {composition_desc}. {prompt_head}"
+)
+
+
+def _build_structured_prompt(
+    prompt: str,
+    params: FrameParams,
+    camera_desc: str,
+    composition_desc: str,
+    lighting_style: str
+) -> Dict[str, Any]:
+    """Build the V2 structured prompt dict in a single expression.
+    
+    Shared by generation and refinement through _structured_prompt_json.
+    """
+    return {
+        "short_description": _SHORT_DESCRIPTION_TEMPLATE.format_map({
+            "camera_desc": camera_desc,
+            "composition_desc": composition_desc,
+            "prompt_head": prompt[:200],
+        }),
+        
+        "objects": [
+            {
+                "description": f"Main subject of the scene with professional cinematography treatment, shot {camera_desc}",
+                "location": "center" if params.composition == "centered" else "following rule of thirds",
+                "relationship": "Primary focus of the cinematic composition",
+                "relative_size": "large within frame" if params.fov > 70 else "medium within frame",
+                "shape_and_color": "Cinematically lit with professional color grading",
+                "texture": "High-definition detail with cinematic quality",
+                "appearance_details": f"Professional {lighting_style} with {params.color_temp}K color temperature",
+                "expression": "Cinematic mood appropriate to the scene",
+                "orientation": f"Positioned {camera_desc}"
+            }
+        ],
+        
+        "background_setting": f"Professional cinematic environment with {lighting_style}, shot with {params.fov}mm equivalent lens for cinematic depth of field",
+        
+        "lighting": {
+            "conditions": f"{lighting_style} with {params.color_temp}K color temperature",
+            "direction": f"Professional cinema lighting setup {camera_desc}",
+            "shadows": f"Cinematic shadows with {params.contrast}% contrast and {params.hdr_bloom}% HDR bloom for professional depth"
+        },
+        
+        "aesthetics": {
+            "composition": f"Professional cinematography {composition_desc}",
+            "color_scheme": f"Cinema-grade color grading at {params.color_temp}K with {params.hdr_bloom}% HDR enhancement",
+            "mood_atmosphere": f"Professional cinematic mood with {lighting_style}",
+            "preference_score": "very high",
+            "aesthetic_score": "very high"
+        },
+        
+        "photographic_characteristics": {
+            "depth_of_field": "Cinematic shallow depth of field" if params.fov > 50 else "Standard cinematic depth",
+            "focus": "Professional cinema focus with sharp subject isolation",
+            "camera_angle": f"Professional {camera_desc}",
+            "lens_focal_length": f"{params.fov}mm equivalent for cinematic perspective"
+        },
+        
+        "style_medium": "photograph",
+        
+        "context": "Professional cinematography for film production, featuring high-end cinema-quality lighting, composition, and technical execution suitable for theatrical release",
+        
+        "artistic_style": "cinematic, professional, high-definition, dramatic",
+    }
+
+
+@lru_cache(maxsize=512)
+def _structured_prompt_json(prompt: str, params: FrameParams) -> str:
+    """Create V2 structured prompt following official Bria API schema.
+    
+    Cached on (prompt, params): FrameParams is frozen and hashable, so retries
+    and repeated frames reuse the serialized JSON string.
+    """
+    
+    # Determine lighting style based on parameters
+    lighting_style = "dramatic low-key lighting" if params.lighting < 40 else "balanced professional lighting"
+    if params.lighting > 70:
+        lighting_style = "bright high-key lighting"
+    
+    # Create camera angle description
+    camera_desc = _ANGLE_DESCRIPTIONS.get(params.camera_angle, "at eye level")
+    composition_desc = _COMPOSITION_DESCRIPTIONS.get(params.composition, "using rule of thirds")
+    
+    return orjson.dumps(
+        _build_structured_prompt(prompt, params, camera_desc, composition_desc, lighting_style)
+    ).decode()
+
+
+# Last formatted second, shared by responses built within the same second
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def _iso_now() -> str:
+    """Current UTC time as an ISO-8601 string, formatted at most once a second."""
+    global _ts_cache
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache = (t, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t)))
+    return _ts_cache[1]
+
+
+# Ask the status endpoint to hold the request open until the job settles
+_LONG_POLL_HEADERS = {"Prefer": "wait=60"}
+_LONG_POLL_TIMEOUT = httpx.Timeout(90.0, connect=15.0)
+
+
+# Statuses that mean "keep polling"
+_PENDING_STATUSES: Final = frozenset({"PENDING", "PROCESSING", "QUEUED", "IN_PROGRESS"})
+_STATUS_FIELD = re.compile(rb'"status"\s*:\s*"([A-Za-z_]+)"')
+
+
+def _pending_status(content: bytes) -> Optional[str]:
+    """Status of a still-running job read straight from the body, else None.
+    
+    Lets intermediate polls skip decoding; anything carrying a result or an
+    unrecognised status gets the full parse.
+    """
+    match = _STATUS_FIELD.search(content)
+    if match is None or b'"result"' in content:
+        return None
+    status = match.group(1).decode().upper()
+    return status if status in _PENDING_STATUSES else None
+
+
+def _poll_interval(poll_count: int) -> float:
+    """Seconds to wait before the next status poll."""
+    return min(30.0, 2 + 1.5 ** poll_count)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry transport failures, 408s, 429s and 5xx.
+
+    Other 4xx responses, failed generations, expired status URLs and poll
+    timeouts are final: resubmitting would fail again or duplicate the job.
+    """
+    if not isinstance(exc, BriaAPIError):
+        return False
+    if exc.error_code == "REQUEST_ERROR":
+        return True
+    if exc.error_code == "HTTP_ERROR":
+        status_code = exc.details.get("status_code")
+        return status_code in (408, 429) or (status_code is not None and status_code >= 500)
+    return False
+
+
+# How long a completed seeded generation is served from the response cache;
+# kept short since entries hold signed result URLs that expire
+_RESPONSE_CACHE_TTL = 3600
+
+
+def _response_cache_key(body: bytes) -> str:
+    """Cache key for a generate request body (prompt, structured prompt, images)."""
+    return "bria:v2:" + blake2b(body, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """In-process TTL cache exposing the redis.asyncio get/setex subset.
+    
+    A redis.asyncio.Redis instance can be passed to BriaClient in its place.
+    """
+    
+    def __init__(self, maxsize: int = 256) -> None:
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Union[str, bytes]]]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[Union[str, bytes]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    async def setex(self, key: str, ttl: int, value: Union[str, bytes]) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+# Returned structured prompts kept for get_structured_prompt()
+_STRUCTURED_PROMPT_STORE_SIZE = 256
+
+# Shared across BriaClient instances, which are created per job
+_default_response_cache = ResponseCache()
+
+
 class BriaClient(LoggerMixin):
     """
     Production-ready Bria AI V2 client using VLM Bridge and structured prompts.
@@ -61,32 +303,54 @@ class BriaClient(LoggerMixin):
     - Structured prompts for precise FIBO control
     - Async HTTP client with connection pooling
     - Automatic retry with exponential backoff
+    - Response cache for repeated identical requests
     - Rate limiting and request queuing
     - Comprehensive error handling and monitoring
     - Professional HDR/EXR output support
     """
     
-    def __init__(self) -> None:
+    def __init__(self, cache: Optional[Any] = None) -> None:
         # Use production Bria V2 endpoint
         self.base_url = settings.BRIA_BASE_URL
         self.api_key = settings.BRIA_API_KEY
         
-        print(f"settings.BRIA_API_KEY:: {settings.BRIA_API_KEY}")
         # HTTP client configuration for V2 API
+        # HTTP/2 multiplexes concurrent generate/poll calls over one connection;
+        # the transport retries failed connects before any request is sent
         self.client = httpx.AsyncClient(
-            base_url=self.base_url,
+            base_url=httpx.URL(self.base_url),
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=settings.BRIA_MAX_CONCURRENCY * 4,
+                ),
+            ),
             headers={
                 "api_token": self.api_key,  # V2 uses api_token header
-                "Content-Type": "application/json",
                 "User-Agent": f"SceneForge/{settings.APP_VERSION}",
             },
             timeout=httpx.Timeout(120.0, connect=15.0),  # Longer timeout for V2
-            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
         )
+        # Sent only with request bodies, so status polls and GETs omit it
+        self._json_headers = httpx.Headers({"Content-Type": "application/json"})
         
         # Rate limiting for production use
-        self._request_times: List[float] = []
         self._max_requests_per_minute = 20  # Conservative for V2 API
+        # Bounded to the cap: appending past it drops the oldest timestamp
+        self._request_times: Deque[float] = deque(maxlen=self._max_requests_per_minute)
+        self._rate_limit_lock = asyncio.Lock()
+        # Caps requests in flight at once, independent of the per-minute window
+        self._inflight = asyncio.Semaphore(self._max_requests_per_minute)
+        # Completed responses keyed by request body; anything with get/setex
+        self._cache = cache if cache is not None else _default_response_cache
+        # Structured prompts from completed generations, keyed by content hash
+        self._structured_prompts: "OrderedDict[str, str]" = OrderedDict()
+        # One shared generation per request body, keyed like the response cache
+        self._inflight_generations: Dict[str, "asyncio.Future[BriaGenerationResponse]"] = {}
+        # One shared poller per status URL, keyed by URL
+        self._inflight_polls: Dict[str, "asyncio.Future[BriaGenerationResponse]"] = {}
         
     async def __aenter__(self) -> "BriaClient":
         """Async context manager entry."""
@@ -100,112 +364,35 @@ class BriaClient(LoggerMixin):
         """Close the HTTP client."""
         await self.client.aclose()
     
-    def _enforce_rate_limit(self) -> None:
-        """Enforce rate limiting."""
-        now = time.time()
-        
-        # Remove requests older than 1 minute
-        self._request_times = [
-            req_time for req_time in self._request_times 
-            if now - req_time < 60
-        ]
-        
-        # Check if we're at the limit
-        if len(self._request_times) >= self._max_requests_per_minute:
-            sleep_time = 60 - (now - self._request_times[0])
-            if sleep_time > 0:
-                self.logger.warning(
-                    "Rate limit reached, sleeping",
-                    sleep_time=sleep_time
-                )
-                time.sleep(sleep_time)
+    async def _enforce_rate_limit(self) -> None:
+        """Enforce rate limiting without blocking the event loop."""
+        # Slots are reserved in arrival order under the lock; the wait for a
+        # reserved slot happens after releasing it, so callers never queue
+        # behind another caller's sleep
+        async with self._rate_limit_lock:
+            now = time.monotonic()
+            
+            # Remove requests older than 1 minute
+            while self._request_times and now - self._request_times[0] >= 60:
+                self._request_times.popleft()
+            
+            # At the limit, the next slot opens when the oldest request expires
+            slot = now
+            if len(self._request_times) >= self._max_requests_per_minute:
+                slot = self._request_times[0] + 60
+            self._request_times.append(slot)
         
-        self._request_times.append(now)
+        sleep_time = slot - now
+        if sleep_time > 0:
+            self.logger.warning(
+                "Rate limit reached, sleeping",
+                sleep_time=sleep_time
+            )
+            await asyncio.sleep(sleep_time)
     
     def _create_structured_prompt(self, prompt: str, params: FrameParams) -> str:
         """Create V2 structured prompt following official Bria API schema."""
-        
-        # Map camera angles to descriptive terms
-        angle_descriptions = {
-            "eye-level": "at eye level, creating natural perspective",
-            "low-angle": "from a low angle, creating dramatic upward perspective", 
-            "high-angle": "from a high angle, providing overview perspective",
-            "dutch-angle": "with dutch tilt, creating dynamic diagonal composition",
-            "birds-eye": "from birds-eye view, aerial perspective",
-            "worms-eye": "from worms-eye view, extreme low angle",
-            "over-shoulder": "over-shoulder perspective",
-            "pov": "first-person point of view",
-        }
-        
-        # Map composition rules
-        composition_descriptions = {
-            "rule-of-thirds": "using rule of thirds composition for balanced framing",
-            "centered": "with centered composition for symmetrical balance",
-            "symmetrical": "with symmetrical composition",
-            "leading-lines": "using leading lines to guide the eye",
-            "frame-within-frame": "with frame-within-frame technique",
-            "negative-space": "utilizing negative space for minimalist impact",
-            "golden-ratio": "following golden ratio proportions",
-        }
-        
-        # Determine lighting style based on parameters
-        lighting_style = "dramatic low-key lighting" if params.lighting < 40 else "balanced professional lighting"
-        if params.lighting > 70:
-            lighting_style = "bright high-key lighting"
-        
-        # Create camera angle description
-        camera_desc = angle_descriptions.get(params.camera_angle, "at eye level")
-        composition_desc = composition_descriptions.get(params.composition, "using rule of thirds")
-        
-        # Create V2 structured prompt following official schema
-        structured_prompt = BriaV2StructuredPrompt(
-            short_description=f"A professional cinematographic shot {camera_desc}, {composition_desc}. {prompt[:200]}",
-            
-            objects=[
-                {
-                    "description": f"Main subject of the scene with professional cinematography treatment, shot {camera_desc}",
-                    "location": "center" if params.composition == "centered" else "following rule of thirds",
-                    "relationship": "Primary focus of the cinematic composition",
-                    "relative_size": "large within frame" if params.fov > 70 else "medium within frame",
-                    "shape_and_color": "Cinematically lit with professional color grading",
-                    "texture": "High-definition detail with cinematic quality",
-                    "appearance_details": f"Professional {lighting_style} with {params.color_temp}K color temperature",
-                    "expression": "Cinematic mood appropriate to the scene",
-                    "orientation": f"Positioned {camera_desc}"
-                }
-            ],
-            
-            background_setting=f"Professional cinematic environment with {lighting_style}, shot with {params.fov}mm equivalent lens for cinematic depth of field",
-            
-            lighting={
-                "conditions": f"{lighting_style} with {params.color_temp}K color temperature",
-                "direction": f"Professional cinema lighting setup {camera_desc}",
-                "shadows": f"Cinematic shadows with {params.contrast}% contrast and {params.hdr_bloom}% HDR bloom for professional depth"
-            },
-            
-            aesthetics={
-                "composition": f"Professional cinematography {composition_desc}",
-                "color_scheme": f"Cinema-grade color grading at {params.color_temp}K with {params.hdr_bloom}% HDR enhancement",
-                "mood_atmosphere": f"Professional cinematic mood with {lighting_style}",
-                "preference_score": "very high",
-                "aesthetic_score": "very high"
-            },
-            
-            photographic_characteristics={
-                "depth_of_field": "Cinematic shallow depth of field" if params.fov > 50 else "Standard cinematic depth",
-                "focus": "Professional cinema focus with sharp subject isolation",
-                "camera_angle": f"Professional {camera_desc}",
-                "lens_focal_length": f"{params.fov}mm equivalent for cinematic perspective"
-            },
-            
-            style_medium="photograph",
-            
-            context="Professional cinematography for film production, featuring high-end cinema-quality lighting, composition, and technical execution suitable for theatrical release",
-            
-            artistic_style="cinematic, professional, high-definition, dramatic"
-        )
-        
-        return json.dumps(structured_prompt.dict(), separators=(',', ':'))
+        return _structured_prompt_json(prompt, params)
     
     def _params_to_bria_request(
         self, 
@@ -231,9 +418,11 @@ class BriaClient(LoggerMixin):
         **kwargs
     ) -> Dict[str, Any]:
         """Make HTTP request with V2 API error handling."""
-        self._enforce_rate_limit()
+        await self._enforce_rate_limit()
         
         url = endpoint
+        if "content" in kwargs:
+            kwargs.setdefault("headers", self._json_headers)
         
         try:
             self.logger.info(
@@ -243,11 +432,12 @@ class BriaClient(LoggerMixin):
                 api_version="v2"
             )
             
-            response = await self.client.request(method, url, **kwargs)
+            async with self._inflight:
+                response = await self.client.request(method, url, **kwargs)
             
             # V2 API returns 202 for async requests
             if response.status_code == 202:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.logger.info(
                     "Bria V2 async request accepted",
                     status_code=response.status_code,
@@ -256,7 +446,7 @@ class BriaClient(LoggerMixin):
                 return data
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             self.logger.info(
                 "Bria V2 API request successful",
@@ -269,9 +459,10 @@ class BriaClient(LoggerMixin):
         except httpx.HTTPStatusError as e:
             error_msg = f"Bria V2 API HTTP error: {e.response.status_code}"
             try:
-                error_detail = e.response.json()
+                error_detail = orjson.loads(e.response.content)
                 error_msg += f" - {error_detail.get('error', error_detail.get('message', 'Unknown error'))}"
-            except:
+            except (orjson.JSONDecodeError, AttributeError):
+                # Non-JSON or non-object error body
                 error_msg += f" - {e.response.text}"
             
             self.logger.error(
@@ -281,18 +472,141 @@ class BriaClient(LoggerMixin):
                 endpoint=endpoint
             )
             
-            raise BriaAPIError(error_msg, error_code="HTTP_ERROR")
+            raise BriaAPIError(
+                error_msg,
+                error_code="HTTP_ERROR",
+                details={"status_code": e.response.status_code},
+            )
             
         except httpx.RequestError as e:
             error_msg = f"Bria V2 API request error: {str(e)}"
             self.logger.error("Bria V2 API request error", error=error_msg, endpoint=endpoint)
             raise BriaAPIError(error_msg, error_code="REQUEST_ERROR")
     
+    async def _get_cached_response(self, key: str) -> Optional[BriaGenerationResponse]:
+        """Return a cached response for key, if any."""
+        cached = await self._cache.get(key)
+        if cached is None:
+            return None
+        self.logger.info("Bria response cache hit", cache_key=key)
+        return BriaGenerationResponse.model_validate_json(cached)
+    
+    async def _submit_generation(
+        self,
+        body: bytes,
+        cache_key: str,
+        cache_result: bool
+    ) -> BriaGenerationResponse:
+        """POST a generate request, wait for the result and optionally cache it."""
+        response_data = await self._make_request(
+            "POST",
+            "/v2/image/generate",
+            content=body
+        )
+        
+        # V2 returns 202 with status_url for polling
+        if "status_url" in response_data:
+            result = await self._poll_v2_generation(response_data["status_url"])
+        else:
+            # Synchronous response (rare in V2)
+            result = BriaGenerationResponse(**response_data)
+        
+        if cache_result:
+            await self._cache.setex(cache_key, _RESPONSE_CACHE_TTL, result.model_dump_json())
+        return result
+    
+    def _remember_structured_prompt(self, structured_prompt: Any) -> Optional[str]:
+        """Keep a returned structured prompt out of response metadata.
+        
+        Returns the content hash stored in its place.
+        """
+        if not structured_prompt:
+            return None
+        if not isinstance(structured_prompt, str):
+            structured_prompt = orjson.dumps(structured_prompt).decode()
+        digest = blake2b(structured_prompt.encode(), digest_size=16).hexdigest()
+        self._structured_prompts[digest] = structured_prompt
+        self._structured_prompts.move_to_end(digest)
+        while len(self._structured_prompts) > _STRUCTURED_PROMPT_STORE_SIZE:
+            self._structured_prompts.popitem(last=False)
+        return digest
+    
+    def get_structured_prompt(self, digest: str) -> Optional[str]:
+        """Full structured prompt for a metadata hash, if still held."""
+        return self._structured_prompts.get(digest)
+    
+    def _log_retry(self, retry_state: RetryCallState) -> None:
+        """Log a failed attempt before tenacity sleeps."""
+        self.logger.warning(
+            "Bria V2 API request failed, retrying",
+            attempt=retry_state.attempt_number,
+            wait_time=retry_state.next_action.sleep,
+            error=str(retry_state.outcome.exception())
+        )
+    
+    async def _generate_with_retries(
+        self,
+        body: bytes,
+        cache_key: str,
+        cache_result: bool,
+        max_retries: int
+    ) -> BriaGenerationResponse:
+        """Submit a generate request, retrying transient failures with jittered backoff."""
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(max_retries + 1),
+            wait=wait_exponential_jitter(initial=1, max=30),
+            retry=retry_if_exception(_is_retryable),
+            before_sleep=self._log_retry,
+            reraise=True,
+        )
+        return await retrying(self._submit_generation, body, cache_key, cache_result)
+    
+    async def _generate(
+        self,
+        body: bytes,
+        cache_key: str,
+        cacheable: bool,
+        bypass_cache: bool,
+        max_retries: int
+    ) -> BriaGenerationResponse:
+        """Run a generate request, sharing it only when its result may be shared.
+        
+        Unseeded requests and ones bypassing the cache each want their own
+        sample, so they are never joined to an identical request in flight.
+        """
+        if cacheable and not bypass_cache:
+            return await self._generate_coalesced(body, cache_key, max_retries)
+        return await self._generate_with_retries(body, cache_key, cacheable, max_retries)
+    
+    async def _generate_coalesced(
+        self,
+        body: bytes,
+        cache_key: str,
+        max_retries: int
+    ) -> BriaGenerationResponse:
+        """Run a cacheable generate request, joining an identical one already in flight."""
+        pending = self._inflight_generations.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._generate_with_retries(body, cache_key, True, max_retries)
+            )
+            self._inflight_generations[cache_key] = pending
+            pending.add_done_callback(
+                lambda _: self._inflight_generations.pop(cache_key, None)
+            )
+        else:
+            self.logger.info("Joining in-flight Bria generation", cache_key=cache_key)
+        
+        # Shielded so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(pending)
+    
     async def generate_image(
         self,
         prompt: str,
         params: FrameParams,
-        max_retries: int = 3
+        max_retries: int = 3,
+        bypass_cache: bool = False,
+        seed: Optional[int] = None
     ) -> BriaGenerationResponse:
         """
         Generate image using Bria V2 API with VLM Bridge and structured prompts.
@@ -301,6 +615,9 @@ class BriaClient(LoggerMixin):
             prompt: Scene description
             params: Generation parameters
             max_retries: Maximum retry attempts
+            bypass_cache: Always call the API, e.g. to regenerate a frame
+            seed: Pin the sample; only seeded results are cached, so unseeded
+                repeats get a fresh image
             
         Returns:
             Generation response with image URL
@@ -314,51 +631,103 @@ class BriaClient(LoggerMixin):
             return await self._get_mock_response(prompt, params)
         
         request_data = self._params_to_bria_request(prompt, params)
+        request_data.seed = seed
+        # Encoded once; _make_request adds the JSON Content-Type for bodies
+        body = orjson.dumps(request_data.to_payload())
+        cache_key = _response_cache_key(body)
+        
+        cacheable = seed is not None
+        if cacheable and not bypass_cache:
+            cached = await self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
         
-        for attempt in range(max_retries + 1):
+        try:
+            # Start V2 generation (async by default)
+            return await self._generate(body, cache_key, cacheable, bypass_cache, max_retries)
+        except BriaAPIError as e:
+            # Fall back to mock response on final failure
+            self.logger.error(
+                "Bria V2 API failed after all retries, using mock response",
+                error=str(e),
+                error_code=e.error_code
+            )
+            return await self._get_mock_response(prompt, params)
+    
+    async def generate_images_batch(
+        self,
+        jobs: List[Tuple[str, FrameParams]],
+        concurrency: Optional[int] = None,
+        on_result: Optional[
+            Callable[[int, Union[BriaGenerationResponse, Exception]], Awaitable[None]]
+        ] = None
+    ) -> List[Union[BriaGenerationResponse, BaseException]]:
+        """
+        Generate several images concurrently over this client's pool.
+        
+        Args:
+            jobs: (prompt, params) pairs, one per image
+            concurrency: Maximum generations in flight at once; defaults to
+                BRIA_MAX_CONCURRENCY
+            on_result: Awaited with (job index, response or exception) as each
+                job finishes, after its concurrency slot is released
+            
+        Returns:
+            Responses in job order; a failed job yields its exception
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.BRIA_MAX_CONCURRENCY)
+        
+        async def _one(
+            index: int,
+            prompt: str,
+            params: FrameParams
+        ) -> Union[BriaGenerationResponse, Exception]:
             try:
-                # Start V2 generation (async by default)
-                response_data = await self._make_request(
-                    "POST",
-                    "/v2/image/generate",
-                    json=request_data.dict(exclude_none=True)
-                )
-                
-                # V2 returns 202 with status_url for polling
-                if "status_url" in response_data:
-                    return await self._poll_v2_generation(response_data["status_url"])
-                else:
-                    # Synchronous response (rare in V2)
-                    return BriaGenerationResponse(**response_data)
-                
-            except BriaAPIError as e:
-                if attempt == max_retries:
-                    # Fall back to mock response on final failure
-                    self.logger.error(
-                        "Bria V2 API failed after all retries, using mock response",
-                        error=str(e),
-                        attempts=max_retries + 1
-                    )
-                    return await self._get_mock_response(prompt, params)
-                
-                wait_time = 2 ** attempt  # Exponential backoff
-                self.logger.warning(
-                    "Bria V2 API request failed, retrying",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    wait_time=wait_time,
-                    error=str(e)
-                )
-                await asyncio.sleep(wait_time)
+                async with semaphore:
+                    result = await self.generate_image(prompt, params)
+            except Exception as e:
+                result = e
+            if on_result is not None:
+                await on_result(index, result)
+            return result
+        
+        return await asyncio.gather(
+            *(_one(index, prompt, params) for index, (prompt, params) in enumerate(jobs)),
+            return_exceptions=True,
+        )
     
     async def _poll_v2_generation(
         self,
         status_url: str,
         max_wait_time: int = 600  # 10 minutes for V2 high-quality generation
     ) -> BriaGenerationResponse:
-        """Poll V2 generation status until completion."""
+        """Poll V2 generation status until completion.
+        
+        Concurrent callers waiting on the same status URL share one poller.
+        """
+        pending = self._inflight_polls.get(status_url)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._poll_status_url(status_url, max_wait_time)
+            )
+            self._inflight_polls[status_url] = pending
+            pending.add_done_callback(
+                lambda _: self._inflight_polls.pop(status_url, None)
+            )
+        
+        # Shielded so one cancelled waiter does not cancel the shared poll
+        return await asyncio.shield(pending)
+    
+    async def _poll_status_url(
+        self,
+        status_url: str,
+        max_wait_time: int
+    ) -> BriaGenerationResponse:
+        """Poll a V2 status URL, long-polling where the server allows it."""
         start_time = time.time()
-        poll_interval = 3  # Start with 3 second intervals
+        poll_count = 0
+        poll_interval = _poll_interval(poll_count)
+        long_poll = True
         
         self.logger.info(
             "Starting V2 generation polling",
@@ -368,10 +737,34 @@ class BriaClient(LoggerMixin):
         
         while time.time() - start_time < max_wait_time:
             try:
-                # Poll the status URL directly
-                response = await self.client.get(status_url)
+                # Poll the status URL directly; servers that honour Prefer
+                # hold the request open until the status changes. Polls stay
+                # outside the per-minute submission budget and the in-flight
+                # cap, so a held long-poll never blocks a submission.
+                if long_poll:
+                    response = await self.client.get(
+                        status_url,
+                        headers=_LONG_POLL_HEADERS,
+                        timeout=_LONG_POLL_TIMEOUT,
+                    )
+                else:
+                    response = await self.client.get(status_url)
                 response.raise_for_status()
-                response_data = response.json()
+                
+                # Intermediate polls only need the status field
+                pending_status = _pending_status(response.content)
+                if pending_status is not None:
+                    self.logger.debug(
+                        "V2 generation status check",
+                        status=pending_status,
+                        elapsed_time=time.time() - start_time
+                    )
+                    poll_count += 1
+                    poll_interval = _poll_interval(poll_count)
+                    await asyncio.sleep(poll_interval)
+                    continue
+                
+                response_data = orjson.loads(response.content)
                 
                 # V2 API wraps result in 'result' field when completed
                 if "result" in response_data:
@@ -391,11 +784,13 @@ class BriaClient(LoggerMixin):
                         image_url=result_data.get("image_url"),
                         metadata={
                             "seed": result_data.get("seed"),
-                            "structured_prompt": result_data.get("structured_prompt"),
+                            "structured_prompt_hash": self._remember_structured_prompt(
+                                result_data.get("structured_prompt")
+                            ),
                             "warning": result_data.get("warning")
                         },
-                        created_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
-                        completed_at=time.strftime("%Y-%m-%dT%H:%M:%S")
+                        created_at=_iso_now(),
+                        completed_at=_iso_now()
                     )
                 
                 # Handle other status formats
@@ -426,13 +821,10 @@ class BriaClient(LoggerMixin):
                         error_code="GENERATION_FAILED"
                     )
                     
-                elif status.upper() in ["PENDING", "PROCESSING", "QUEUED", "IN_PROGRESS"]:
-                    # Adaptive polling - increase interval over time
-                    elapsed = time.time() - start_time
-                    if elapsed > 60:  # After 1 minute, poll every 5 seconds
-                        poll_interval = 5
-                    elif elapsed > 180:  # After 3 minutes, poll every 10 seconds
-                        poll_interval = 10
+                elif status.upper() in _PENDING_STATUSES:
+                    # Exponential backoff between polls, capped at 30 seconds
+                    poll_count += 1
+                    poll_interval = _poll_interval(poll_count)
                     
                     await asyncio.sleep(poll_interval)
                     continue
@@ -453,6 +845,13 @@ class BriaClient(LoggerMixin):
                         "V2 generation status URL not found",
                         error_code="STATUS_URL_NOT_FOUND"
                     )
+                elif long_poll and 400 <= e.response.status_code < 500:
+                    # Long-poll not supported; retry at once as a plain poll
+                    self.logger.info(
+                        "V2 status long-poll rejected, falling back to polling",
+                        status_code=e.response.status_code
+                    )
+                    long_poll = False
                 else:
                     self.logger.error(
                         "Error polling V2 generation status",
@@ -461,7 +860,7 @@ class BriaClient(LoggerMixin):
                     )
                     await asyncio.sleep(poll_interval * 2)  # Wait longer on errors
                     
-            except Exception as e:
+            except (httpx.RequestError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
                 self.logger.error(
                     "Unexpected error polling V2 generation status",
                     error=str(e),
@@ -499,12 +898,12 @@ class BriaClient(LoggerMixin):
             image_url="/placeholder.svg",  # Placeholder for demo
             metadata={
                 "prompt": prompt,
-                "params": params.dict(),
+                "params": params.model_dump(mode="json"),
                 "mock": True,
                 "message": "Mock response - Bria API key not configured"
             },
-            created_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
-            completed_at=time.strftime("%Y-%m-%dT%H:%M:%S")
+            created_at=_iso_now(),
+            completed_at=_iso_now()
         )
     
     async def get_account_info(self) -> Dict[str, Any]:
@@ -565,7 +964,9 @@ class BriaClient(LoggerMixin):
         params: FrameParams,
         structured_prompt: Optional[str] = None,
         original_image_url: Optional[str] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        bypass_cache: bool = False,
+        seed: Optional[int] = None
     ) -> BriaGenerationResponse:
         """
         Refine an existing image using Bria V2 API.
@@ -581,6 +982,8 @@ class BriaClient(LoggerMixin):
             structured_prompt: Optional structured prompt from previous generation
             original_image_url: Optional image URL for image-based refinement
             max_retries: Maximum retry attempts
+            bypass_cache: Always call the API instead of reusing a cached result
+            seed: Pin the sample; only seeded results are cached
             
         Returns:
             BriaGenerationResponse with refined image
@@ -611,45 +1014,53 @@ class BriaClient(LoggerMixin):
             request_data["images"] = [original_image_url]
             self.logger.info("Using image URL for refinement", image_url=original_image_url[:100])
         
-        for attempt in range(max_retries + 1):
-            try:
-                self.logger.info(
-                    "Refining image with Bria V2 API",
-                    refinement_prompt=refinement_prompt[:100],
-                    has_structured_prompt=bool(structured_prompt),
-                    has_image_url=bool(original_image_url),
-                )
-                
-                # Start V2 refinement
-                response_data = await self._make_request(
-                    "POST",
-                    "/v2/image/generate",
-                    json=request_data
-                )
-                
-                # V2 returns 202 with status_url for polling
-                if "status_url" in response_data:
-                    return await self._poll_v2_generation(response_data["status_url"])
-                else:
-                    # Synchronous response
-                    return BriaGenerationResponse(**response_data)
-                
-            except BriaAPIError as e:
-                if attempt == max_retries:
-                    # Fall back to mock response on final failure
-                    self.logger.error(
-                        "Bria V2 refinement failed after all retries, using mock response",
-                        error=str(e),
-                        attempts=max_retries + 1
-                    )
-                    return await self._get_mock_response(f"{original_prompt} (refined)", params)
-                
-                wait_time = 2 ** attempt
-                self.logger.warning(
-                    "Bria V2 refinement failed, retrying",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    wait_time=wait_time,
-                    error=str(e)
-                )
-                await asyncio.sleep(wait_time)
+        if seed is not None:
+            request_data["seed"] = seed
+        
+        body = orjson.dumps(request_data)
+        cache_key = _response_cache_key(body)
+        
+        cacheable = seed is not None
+        if cacheable and not bypass_cache:
+            cached = await self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
+        self.logger.info(
+            "Refining image with Bria V2 API",
+            refinement_prompt=refinement_prompt[:100],
+            has_structured_prompt=bool(structured_prompt),
+            has_image_url=bool(original_image_url),
+        )
+        
+        try:
+            # Start V2 refinement
+            return await self._generate(body, cache_key, cacheable, bypass_cache, max_retries)
+        except BriaAPIError as e:
+            # Fall back to mock response on final failure
+            self.logger.error(
+                "Bria V2 refinement failed after all retries, using mock response",
+                error=str(e),
+                error_code=e.error_code
+            )
+            return await self._get_mock_response(f"{original_prompt} (refined)", params)
+
+
+# Process-wide client so the connection pool and TLS sessions are reused
+_shared_client: Optional[BriaClient] = None
+
+
+def get_bria_client() -> BriaClient:
+    """Return the shared BriaClient, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = BriaClient()
+    return _shared_client
+
+
+async def close_bria_client() -> None:
+    """Close the shared BriaClient, if one was created."""
+    global _shared_client
+    if _shared_client is not None:
+        client, _shared_client = _shared_client, None
+        await client.close()
@@ -2,19 +2,367 @@
 Export service - Handles project exports in various formats.
 """
 
+import asyncio
+import importlib.util
+import io
 import json
 import os
+import subprocess
 import tempfile
 import zipfile
 from datetime import datetime
+from functools import lru_cache
+from hashlib import blake2b
+from html import escape
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
 
 from app.core.config import settings
 from app.core.logging import LoggerMixin
 from app.models.database import Frame, Project
 
 
+# URL prefix of locally stored frame images
+_UPLOAD_PREFIX = "/uploads/"
+_UPLOAD_PREFIX_LEN = len(_UPLOAD_PREFIX)
+
+# Frame attributes written to the JSON export, in output order
+_FRAME_EXPORT_FIELDS = (
+    "id",
+    "sequence_number",
+    "prompt",
+    "image_url",
+    "params",
+    "notes",
+    "created_at",
+)
+_frame_export_values = attrgetter(*_FRAME_EXPORT_FIELDS)
+
+# (crf, preset) per export quality; storyboard frames are static, so faster
+# presets cost no visible quality
+_X264_QUALITY: Dict[str, Tuple[str, str]] = {
+    "high": ("20", "medium"),
+    "medium": ("23", "faster"),
+    "low": ("28", "veryfast"),
+}
+
+
+# MP4 export resolution
+_OUTPUT_SIZE: Tuple[int, int] = (1920, 1080)
+
+# zstd level for compressed text exports; faster than DEFLATE at a better ratio
+_ZSTD_LEVEL = 3
+
+# Hardware H.264 encoders, in order of preference
+_HW_H264_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv")
+
+
+@lru_cache(maxsize=1)
+def _hw_h264_encoder() -> Optional[str]:
+    """First hardware H.264 encoder listed by this ffmpeg build, probed once."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    
+    listed = {fields[1] for fields in map(str.split, result.stdout.splitlines()) if len(fields) > 1}
+    return next((name for name in _HW_H264_ENCODERS if name in listed), None)
+
+
+async def probe_hw_h264_encoder() -> Optional[str]:
+    """Run the hardware-encoder probe in a worker thread; cached after startup."""
+    return await asyncio.to_thread(_hw_h264_encoder)
+
+
+@lru_cache(maxsize=1)
+def _has_pyav() -> bool:
+    """Whether the optional PyAV package is installed."""
+    return importlib.util.find_spec("av") is not None
+
+
+@lru_cache(maxsize=1)
+def _has_zstd() -> bool:
+    """Whether the optional zstandard package is installed."""
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def _zstd_compressed(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a content export result as a zstd-compressed download."""
+    import zstandard
+    
+    return {
+        "content": zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(result["content"]),
+        "media_type": "application/zstd",
+        "filename": f"{result['filename']}.zst"
+    }
+
+
+def _h264_encoder_args(encoder: str, crf: str, preset: str) -> List[str]:
+    """ffmpeg video codec arguments for an encoder at the given quality."""
+    if encoder == "h264_nvenc":
+        return ['-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr', '-cq', crf]
+    if encoder == "h264_videotoolbox":
+        return ['-c:v', 'h264_videotoolbox', '-q:v', '50']
+    if encoder == "h264_qsv":
+        return ['-c:v', 'h264_qsv', '-global_quality', crf]
+    return [
+        '-c:v', 'libx264',
+        '-crf', crf,
+        '-preset', preset,
+        '-tune', 'stillimage',  # Frames are held static for 2s each
+    ]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that hands ZipFile output back in chunks."""
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _mp4_cache_key(
+    project: Project,
+    frames: List[Frame],
+    fps: int,
+    crf: str,
+    preset: str
+) -> str:
+    """Content key for an MP4 export: project revision, frame images and encode options."""
+    key_source = "|".join((
+        project.updated_at.isoformat(),
+        str(fps),
+        crf,
+        preset,
+        *(f"{frame.id}:{frame.image_url}" for frame in frames),
+    ))
+    return blake2b(key_source.encode(), digest_size=16).hexdigest()
+
+
+def _fit_filter(size: Tuple[int, int]) -> str:
+    """Letterbox filter for frames of one known size, with precomputed scale and pad offsets."""
+    out_w, out_h = _OUTPUT_SIZE
+    width, height = size
+    ratio = min(out_w / width, out_h / height)
+    # yuv420p needs even dimensions
+    scaled_w = min(out_w, max(2, int(width * ratio) // 2 * 2))
+    scaled_h = min(out_h, max(2, int(height * ratio) // 2 * 2))
+    pad_x = (out_w - scaled_w) // 2
+    pad_y = (out_h - scaled_h) // 2
+    return f"scale={scaled_w}:{scaled_h},pad={out_w}:{out_h}:{pad_x}:{pad_y},format=yuv420p"
+
+
+def _concat_quote(path: Path) -> str:
+    """Quote a path for an ffmpeg concat list entry."""
+    return "'" + str(path).replace("'", "'\\''") + "'"
+
+
+# Static parts of the slideshow HTML and Nuke script, filled with str.format
+_SLIDESHOW_HEAD_TMPL = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{project_name} - Storyboard</title>
+    <style>
+        body {{
+            margin: 0;
+            padding: 0;
+            background: #000;
+            font-family: Arial, sans-serif;
+            overflow: hidden;
+        }}
+        .slideshow-container {{
+            position: relative;
+            width: 100vw;
+            height: 100vh;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+        .slide {{
+            display: none;
+            width: 100%;
+            height: 100%;
+            position: relative;
+        }}
+        .slide.active {{
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+        .slide img {{
+            max-width: 100%;
+            max-height: 100%;
+            object-fit: contain;
+        }}
+        .slide-info {{
+            position: absolute;
+            bottom: 20px;
+            left: 20px;
+            color: white;
+            background: rgba(0,0,0,0.7);
+            padding: 10px;
+            border-radius: 5px;
+        }}
+        .progress-bar {{
+            position: absolute;
+            bottom: 0;
+            left: 0;
+            height: 4px;
+            background: #00ff88;
+            transition: width {frame_duration}s linear;
+        }}
+    </style>
+</head>
+<body>
+    <div class="slideshow-container">
+"""
+
+_SLIDESHOW_TAIL_TMPL = """
+    </div>
+    
+    <script>
+        let currentSlide = 0;
+        const slides = document.querySelectorAll('.slide');
+        const totalSlides = slides.length;
+        const frameDuration = {frame_duration_ms}; // Convert to milliseconds
+        
+        function showSlide(index) {{
+            slides.forEach(slide => slide.classList.remove('active'));
+            slides[index].classList.add('active');
+            
+            // Animate progress bar
+            const progressBar = slides[index].querySelector('.progress-bar');
+            progressBar.style.width = '0%';
+            setTimeout(() => {{
+                progressBar.style.width = '100%';
+            }}, 100);
+        }}
+        
+        function nextSlide() {{
+            currentSlide = (currentSlide + 1) % totalSlides;
+            showSlide(currentSlide);
+        }}
+        
+        // Start slideshow
+        showSlide(0);
+        setInterval(nextSlide, frameDuration);
+        
+        // Keyboard controls
+        document.addEventListener('keydown', (e) => {{
+            if (e.key === 'ArrowRight') {{
+                nextSlide();
+            }} else if (e.key === 'ArrowLeft') {{
+                currentSlide = (currentSlide - 1 + totalSlides) % totalSlides;
+                showSlide(currentSlide);
+            }}
+        }});
+    </script>
+</body>
+</html>
+"""
+
+_NUKE_HEADER_TMPL = """#! Nuke Script Generated by SceneForge
+# Project: {project_name}
+# Generated: {generated}
+# Frame Count: {frame_count}
+
+version 13.2 v5
+define_window_layout_xml {{<?xml version="1.0" encoding="UTF-8"?>
+<layout version="1.0">
+    <window x="0" y="0" w="1920" h="1080" screen="0">
+        <splitter orientation="1">
+            <split size="1200"/>
+            <dock id="" hideTitles="1" activePageId="Viewer.1">
+                <page id="Viewer.1"/>
+            </dock>
+            <split size="720"/>
+            <dock id="" activePageId="DAG.1" focus="true">
+                <page id="DAG.1"/>
+            </dock>
+        </splitter>
+    </window>
+</layout>
+}}
+
+Root {{
+ inputs 0
+ name Root
+ frame 1
+ last_frame {frame_count}
+ format "1920 1080 0 0 1920 1080 1 HD_1080"
+ proxy_type scale
+ proxy_format "1024 778 0 0 1024 778 1 1K_Super_35(full-ap)"
+}}
+
+"""
+
+_NUKE_NODE_TMPL = """
+Read {{
+ inputs 0
+ file "{path}"
+ format "1920 1080 0 0 1920 1080 1 HD_1080"
+ origset true
+ frame {n}
+ name Read_Frame_{n:02d}
+ xpos {xpos}
+ ypos 100
+}}
+
+Text2 {{
+ font_size 24
+ message "Frame {n}: {prompt}..."
+ box {{0 0 1920 100}}
+ xjustify center
+ yjustify center
+ name Text_Frame_{n:02d}
+ xpos {xpos}
+ ypos 200
+}}
+
+"""
+
+_NUKE_FOOTER_TMPL = """
+Switch {{
+ inputs {frame_count}
+ which {{frame-1}}
+ name FrameSequence
+ xpos 500
+ ypos 400
+}}
+
+Viewer {{
+ frame_range 1-{frame_count}
+ name Viewer1
+ xpos 500
+ ypos 500
+}}
+"""
+
+
 class ExportService(LoggerMixin):
     """
     Service for exporting storyboard projects in various formats.
@@ -28,6 +376,7 @@ class ExportService(LoggerMixin):
     
     def __init__(self) -> None:
         self.upload_dir = Path(settings.UPLOAD_DIR).resolve()
+        self.export_cache_dir = Path(settings.EXPORT_CACHE_DIR).resolve()
     
     async def export_project(
         self,
@@ -46,7 +395,8 @@ class ExportService(LoggerMixin):
             options: Export options
             
         Returns:
-            Export result with content, media_type, and filename
+            Export result with media_type, filename and either content
+            (bytes) or stream (an iterator of byte chunks)
         """
         options = options or {}
         
@@ -76,6 +426,8 @@ class ExportService(LoggerMixin):
     ) -> Dict[str, Any]:
         """Export project as JSON."""
         
+        include_metadata = options.get("include_metadata", True)
+        
         # Build comprehensive project data
         project_data = {
             "project": {
@@ -84,31 +436,24 @@ class ExportService(LoggerMixin):
                 "description": project.description,
                 "genre": project.genre.value,
                 "status": project.status.value,
-                "created_at": project.created_at.isoformat(),
-                "updated_at": project.updated_at.isoformat(),
+                "created_at": project.created_at,
+                "updated_at": project.updated_at,
             },
             "frames": [
-                {
-                    "id": frame.id,
-                    "sequence_number": frame.sequence_number,
-                    "prompt": frame.prompt,
-                    "image_url": frame.image_url,
-                    "params": frame.params,
-                    "notes": frame.notes,
-                    "created_at": frame.created_at.isoformat(),
-                } for frame in frames
+                dict(zip(_FRAME_EXPORT_FIELDS, _frame_export_values(frame)))
+                for frame in frames
             ],
             "metadata": {
                 "export_format": "json",
-                "export_timestamp": datetime.utcnow().isoformat(),
+                "export_timestamp": datetime.utcnow(),
                 "frame_count": len(frames),
                 "sceneforge_version": "1.0.0",
-                "include_metadata": options.get("include_metadata", True),
+                "include_metadata": include_metadata,
             }
         }
         
         # Add technical metadata if requested
-        if options.get("include_metadata", True):
+        if include_metadata:
             project_data["technical_specs"] = {
                 "image_format": "PNG",
                 "color_space": "sRGB",
@@ -117,13 +462,22 @@ class ExportService(LoggerMixin):
                 "resolution": "1920x1080",
             }
         
-        json_content = json.dumps(project_data, indent=2, ensure_ascii=False)
-        
-        return {
-            "content": json_content.encode('utf-8'),
+        # orjson writes UTF-8 bytes directly and serializes datetimes natively
+        result = {
+            "content": orjson.dumps(project_data, default=str, option=orjson.OPT_INDENT_2),
             "media_type": "application/json",
             "filename": f"{project.name}_storyboard.json"
         }
+        return self._maybe_compress(result, options)
+    
+    def _maybe_compress(self, result: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply zstd compression when requested and available."""
+        if not options.get("compress"):
+            return result
+        if not _has_zstd():
+            self.logger.warning("zstandard not installed, exporting uncompressed")
+            return result
+        return _zstd_compressed(result)
     
     async def _export_mp4(
         self,
@@ -131,104 +485,160 @@ class ExportService(LoggerMixin):
         frames: List[Frame],
         options: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Export project as MP4 video sequence using ffmpeg."""
+        """Export project as MP4 video sequence using PyAV or ffmpeg."""
         
         try:
-            import subprocess
             import shutil
             
+            has_ffmpeg = shutil.which('ffmpeg') is not None
+            hw_encoder = await probe_hw_h264_encoder() if has_ffmpeg else None
+            
+            # In-process encoding, unless ffmpeg can hand off to hardware
+            use_pyav = _has_pyav() and hw_encoder is None
+            
             # Check if ffmpeg is available
-            if not shutil.which('ffmpeg'):
+            if not use_pyav and not has_ffmpeg:
                 self.logger.warning("ffmpeg not found, falling back to image sequence ZIP")
                 return await self._export_exr_sequence(project, frames, options)
             
-            # Create temporary directory for frames
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
+            # Frames are read in place via absolute paths
+            frame_paths = await self._resolve_frame_paths(
+                [frame.image_url for frame in frames]
+            )
+            valid_frames = [image_path for _, image_path in frame_paths]
+            
+            if not valid_frames:
+                raise ValueError("No valid frames found for video export")
+            
+            # Get options
+            fps = options.get("fps", 2)  # Output frame rate; each still is held for 2s
+            quality = options.get("quality", "high")
+            
+            # Set quality parameters
+            crf, preset = _X264_QUALITY.get(quality, _X264_QUALITY["low"])
+            
+            # Unchanged frames and options reuse the previous encode
+            cache_path = self.export_cache_dir / f"{_mp4_cache_key(project, frames, fps, crf, preset)}.mp4"
+            cached = await asyncio.to_thread(self._read_export_cache, cache_path)
+            if cached is not None:
+                self.logger.info("MP4 export served from cache", file_size=len(cached))
+                return {
+                    "content": cached,
+                    "media_type": "video/mp4",
+                    "filename": f"{project.name}_reel.mp4"
+                }
+            
+            if use_pyav:
+                self.logger.info(
+                    "Encoding MP4 export with PyAV",
+                    frame_count=len(valid_frames),
+                    fps=fps,
+                    quality=quality
+                )
+                video_content = await asyncio.to_thread(
+                    self._encode_mp4_pyav, valid_frames, fps, crf, preset
+                )
+                await asyncio.to_thread(self._write_export_cache, cache_path, video_content)
                 
-                # Copy/link frames to temp directory with sequential naming
-                valid_frames = []
-                for i, frame in enumerate(frames):
-                    if frame.image_url and frame.image_url.startswith('/uploads/'):
-                        image_path = self.upload_dir / frame.image_url[9:]
-                        
-                        if image_path.exists():
-                            # Copy to temp with sequential naming
-                            dest_path = temp_path / f"frame_{i+1:04d}.png"
-                            shutil.copy2(str(image_path), str(dest_path))
-                            valid_frames.append(dest_path)
-                        else:
-                            self.logger.warning(f"Image not found: {image_path}")
+                self.logger.info(
+                    "MP4 export completed",
+                    file_size=len(video_content),
+                    frame_count=len(valid_frames)
+                )
                 
-                if not valid_frames:
-                    raise ValueError("No valid frames found for video export")
+                return {
+                    "content": video_content,
+                    "media_type": "video/mp4",
+                    "filename": f"{project.name}_reel.mp4"
+                }
+            
+            # Temporary directory for the concat list and output video
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_path = Path(temp_dir)
                 
                 # Output video path
                 output_path = temp_path / f"{project.name}_reel.mp4"
                 
-                # Get options
-                fps = options.get("fps", 2)  # 2 seconds per frame = 0.5 fps, but we'll use 2fps and duplicate
-                quality = options.get("quality", "high")
-                
-                # Set quality parameters
-                if quality == "high":
-                    crf = "18"  # High quality
-                    preset = "slow"
-                elif quality == "medium":
-                    crf = "23"  # Medium quality
-                    preset = "medium"
-                else:
-                    crf = "28"  # Lower quality
-                    preset = "fast"
-                
                 # Build ffmpeg command
                 # Use concat demuxer for better control
                 concat_file = temp_path / "concat.txt"
                 with open(concat_file, 'w') as f:
                     for frame_path in valid_frames:
                         # Each frame shows for 2 seconds
-                        f.write(f"file '{frame_path.name}'\n")
+                        f.write(f"file {_concat_quote(frame_path)}\n")
                         f.write(f"duration 2.0\n")
                     # Add last frame again (ffmpeg concat quirk)
-                    f.write(f"file '{valid_frames[-1].name}'\n")
-                
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', str(concat_file),
-                    '-vf', 'scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2',
-                    '-c:v', 'libx264',
-                    '-crf', crf,
-                    '-preset', preset,
-                    '-pix_fmt', 'yuv420p',
-                    '-movflags', '+faststart',
-                    '-y',  # Overwrite output
-                    str(output_path)
-                ]
+                    f.write(f"file {_concat_quote(valid_frames[-1])}\n")
                 
-                self.logger.info(
-                    "Running ffmpeg for MP4 export",
-                    frame_count=len(valid_frames),
-                    fps=fps,
-                    quality=quality
-                )
+                # Frames already at 1080p skip the scale/pad pass; a shared
+                # size gets numeric filter args instead of expressions
+                frame_size = await asyncio.to_thread(self._common_frame_size, valid_frames)
+                if frame_size == _OUTPUT_SIZE:
+                    video_filter = 'format=yuv420p'
+                elif frame_size is not None:
+                    video_filter = _fit_filter(frame_size)
+                else:
+                    video_filter = 'scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2,format=yuv420p'
                 
-                # Run ffmpeg
-                result = subprocess.run(
-                    ffmpeg_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
+                # A listed hardware encoder may still lack a usable device,
+                # so libx264 stays as the fallback
+                encoders = [hw_encoder, "libx264"] if hw_encoder else ["libx264"]
                 
-                if result.returncode != 0:
-                    self.logger.error("ffmpeg failed", stderr=result.stderr)
-                    raise ValueError(f"ffmpeg failed: {result.stderr}")
+                for encoder in encoders:
+                    ffmpeg_cmd = [
+                        'ffmpeg',
+                        '-f', 'concat',
+                        '-safe', '0',
+                        '-i', str(concat_file),
+                        '-vf', video_filter,
+                        '-r', str(fps),  # Encode only fps frames/s of held stills
+                        *_h264_encoder_args(encoder, crf, preset),
+                        '-movflags', '+faststart',
+                        '-y',  # Overwrite output
+                        str(output_path)
+                    ]
+                    
+                    self.logger.info(
+                        "Running ffmpeg for MP4 export",
+                        frame_count=len(valid_frames),
+                        fps=fps,
+                        quality=quality,
+                        encoder=encoder
+                    )
+                    
+                    # Run ffmpeg without blocking the event loop
+                    proc = await asyncio.create_subprocess_exec(
+                        *ffmpeg_cmd,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    try:
+                        _, stderr_bytes = await asyncio.wait_for(
+                            proc.communicate(),
+                            timeout=300  # 5 minute timeout
+                        )
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        await proc.wait()
+                        raise subprocess.TimeoutExpired(ffmpeg_cmd, 300)
+                    
+                    if proc.returncode == 0:
+                        break
+                    stderr = stderr_bytes.decode(errors="replace")
+                    if encoder != "libx264":
+                        self.logger.warning(
+                            "Hardware encoder failed, retrying with libx264",
+                            encoder=encoder,
+                            stderr=stderr[-500:]
+                        )
+                        continue
+                    self.logger.error("ffmpeg failed", stderr=stderr)
+                    raise ValueError(f"ffmpeg failed: {stderr}")
                 
                 # Read the output video
                 with open(output_path, 'rb') as f:
                     video_content = f.read()
+                await asyncio.to_thread(self._write_export_cache, cache_path, video_content)
                 
                 self.logger.info(
                     "MP4 export completed",
@@ -251,6 +661,120 @@ class ExportService(LoggerMixin):
             self.logger.info("Falling back to image sequence export")
             return await self._export_exr_sequence(project, frames, options)
     
+    def _read_export_cache(self, cache_path: Path) -> Optional[bytes]:
+        """Return a cached export and mark it recently used, if present."""
+        try:
+            content = cache_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(cache_path)
+        except OSError:
+            # Evicted by another export since the read; still a hit
+            pass
+        return content
+    
+    def _write_export_cache(self, cache_path: Path, content: bytes) -> None:
+        """Store an export, evicting the least recently used beyond the limit."""
+        temp_name = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-writer temp file, so concurrent writers of one key never mix
+            fd, temp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(content)
+            os.replace(temp_name, cache_path)
+            temp_name = None
+            
+            entries = []
+            for path in cache_path.parent.glob("*.mp4"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            entries.sort(reverse=True)
+            for _, stale in entries[settings.EXPORT_CACHE_MAX_ENTRIES:]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            # The export itself succeeded; caching is best effort
+            self.logger.warning("Failed to cache export", path=str(cache_path), error=str(e))
+        finally:
+            if temp_name is not None:
+                Path(temp_name).unlink(missing_ok=True)
+    
+    def _encode_mp4_pyav(
+        self,
+        frame_paths: List[Path],
+        fps: int,
+        crf: str,
+        preset: str
+    ) -> bytes:
+        """Encode stills held for 2s each into an H.264 MP4 with PyAV."""
+        import av
+        from PIL import Image, ImageOps
+        
+        buffer = io.BytesIO()
+        with av.open(buffer, mode="w", format="mp4") as container:
+            stream = container.add_stream("libx264", rate=fps)
+            stream.width, stream.height = _OUTPUT_SIZE
+            stream.pix_fmt = "yuv420p"
+            stream.options = {"crf": crf, "preset": preset, "tune": "stillimage"}
+            
+            hold = max(1, round(fps * 2))
+            pts = 0
+            for path in frame_paths:
+                with Image.open(path) as image:
+                    # Letterbox to 1080p, matching the ffmpeg scale/pad filter
+                    image = ImageOps.pad(image.convert("RGB"), _OUTPUT_SIZE)
+                frame = av.VideoFrame.from_image(image).reformat(format="yuv420p")
+                for _ in range(hold):
+                    frame.pts = pts
+                    pts += 1
+                    container.mux(stream.encode(frame))
+            
+            # Flush delayed frames
+            container.mux(stream.encode(None))
+        
+        return buffer.getvalue()
+    
+    async def _resolve_frame_paths(self, image_urls: List[Optional[str]]) -> List[Tuple[int, Path]]:
+        """Map stored frame URLs to existing files, keeping each frame's index.
+        
+        The existence checks run concurrently in worker threads.
+        """
+        upload_dir = self.upload_dir
+        candidates = [
+            (i, upload_dir / image_url[_UPLOAD_PREFIX_LEN:])
+            for i, image_url in enumerate(image_urls)
+            if image_url and image_url.startswith(_UPLOAD_PREFIX)
+        ]
+        exists = await asyncio.gather(
+            *(asyncio.to_thread(image_path.exists) for _, image_path in candidates)
+        )
+        
+        found = []
+        for (i, image_path), present in zip(candidates, exists):
+            if present:
+                found.append((i, image_path))
+            else:
+                self.logger.warning(f"Image not found: {image_path}")
+        return found
+    
+    def _common_frame_size(self, paths: List[Path]) -> Optional[Tuple[int, int]]:
+        """Return the size shared by every frame, read from file headers without decoding pixels."""
+        from PIL import Image
+        
+        sizes = set()
+        try:
+            for path in paths:
+                with Image.open(path) as image:
+                    sizes.add(image.size)
+                if len(sizes) > 1:
+                    return None
+        except OSError:
+            return None
+        return sizes.pop() if sizes else None
+    
     async def _export_exr_sequence(
         self,
         project: Project,
@@ -260,49 +784,54 @@ class ExportService(LoggerMixin):
         """Export project as EXR image sequence."""
         
         try:
-            # Create a ZIP file containing all frame images
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-                with zipfile.ZipFile(temp_file.name, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                    
-                    # Add project metadata
-                    metadata = {
-                        "project_name": project.name,
-                        "frame_count": len(frames),
-                        "export_timestamp": datetime.utcnow().isoformat(),
-                        "format": "EXR_SEQUENCE"
-                    }
-                    zip_file.writestr("metadata.json", json.dumps(metadata, indent=2))
-                    
-                    # Add each frame image
-                    for i, frame in enumerate(frames):
-                        if frame.image_url and frame.image_url.startswith('/uploads/'):
-                            # Get the actual image file
-                            image_path = self.upload_dir / frame.image_url[9:]  # Remove '/uploads/'
-                            
-                            if image_path.exists():
-                                # Add to ZIP with sequential naming
-                                sequence_name = f"frame_{i+1:04d}.png"
-                                zip_file.write(str(image_path), sequence_name)
-                            else:
-                                self.logger.warning(f"Image not found: {image_path}")
-                
-                # Read the ZIP content
-                with open(temp_file.name, 'rb') as f:
-                    zip_content = f.read()
-                
-                # Clean up temp file
-                os.unlink(temp_file.name)
-                
-                return {
-                    "content": zip_content,
-                    "media_type": "application/zip",
-                    "filename": f"{project.name}_exr_sequence.zip"
-                }
-                
+            # Streamed per frame; the response iterates it in a worker thread,
+            # so ORM attributes are read here where the session lives
+            frame_paths = await self._resolve_frame_paths(
+                [frame.image_url for frame in frames]
+            )
+            
+            return {
+                "stream": self._iter_exr_zip(project.name, len(frames), frame_paths),
+                "media_type": "application/zip",
+                "filename": f"{project.name}_exr_sequence.zip"
+            }
+            
         except Exception as e:
             self.logger.error("EXR sequence export failed", error=str(e))
             raise ValueError(f"EXR sequence export failed: {str(e)}")
     
+    def _iter_exr_zip(
+        self,
+        project_name: str,
+        frame_count: int,
+        frame_paths: List[Tuple[int, Path]]
+    ) -> Iterator[bytes]:
+        """Yield the image sequence ZIP archive one frame at a time."""
+        sink = _ChunkSink()
+        # PNGs are already zlib-compressed, so frames are stored as-is
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as zip_file:
+            
+            # Add project metadata
+            metadata = {
+                "project_name": project_name,
+                "frame_count": frame_count,
+                "export_timestamp": datetime.utcnow().isoformat(),
+                "format": "EXR_SEQUENCE"
+            }
+            zip_file.writestr(
+                "metadata.json",
+                json.dumps(metadata, indent=2),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+            
+            # Add each frame image with sequential naming
+            for i, image_path in frame_paths:
+                zip_file.write(str(image_path), f"frame_{i+1:04d}.png")
+                yield sink.drain()
+        
+        # Central directory, written on close
+        yield sink.drain()
+    
     async def _export_nuke_script(
         self,
         project: Project,
@@ -315,11 +844,12 @@ class ExportService(LoggerMixin):
             # Generate Nuke script content
             nuke_script = self._generate_nuke_script(project, frames, options)
             
-            return {
+            result = {
                 "content": nuke_script.encode('utf-8'),
                 "media_type": "text/plain",
                 "filename": f"{project.name}_comp.nk"
             }
+            return self._maybe_compress(result, options)
             
         except Exception as e:
             self.logger.error("Nuke script export failed", error=str(e))
@@ -335,130 +865,32 @@ class ExportService(LoggerMixin):
         
         frame_duration = options.get("frame_duration", 3)  # seconds per frame
         
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{project.name} - Storyboard</title>
-    <style>
-        body {{
-            margin: 0;
-            padding: 0;
-            background: #000;
-            font-family: Arial, sans-serif;
-            overflow: hidden;
-        }}
-        .slideshow-container {{
-            position: relative;
-            width: 100vw;
-            height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }}
-        .slide {{
-            display: none;
-            width: 100%;
-            height: 100%;
-            position: relative;
-        }}
-        .slide.active {{
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }}
-        .slide img {{
-            max-width: 100%;
-            max-height: 100%;
-            object-fit: contain;
-        }}
-        .slide-info {{
-            position: absolute;
-            bottom: 20px;
-            left: 20px;
-            color: white;
-            background: rgba(0,0,0,0.7);
-            padding: 10px;
-            border-radius: 5px;
-        }}
-        .progress-bar {{
-            position: absolute;
-            bottom: 0;
-            left: 0;
-            height: 4px;
-            background: #00ff88;
-            transition: width {frame_duration}s linear;
-        }}
-    </style>
-</head>
-<body>
-    <div class="slideshow-container">
-"""
+        # Fragments are joined once at the end rather than grown with +=
+        parts = [_SLIDESHOW_HEAD_TMPL.format(
+            project_name=escape(project.name),
+            frame_duration=frame_duration,
+        )]
         
         # Add slides
         for i, frame in enumerate(frames):
             image_url = frame.image_url
-            if image_url.startswith('/uploads/'):
+            if image_url.startswith(_UPLOAD_PREFIX):
                 image_url = f"http://localhost:8000{image_url}"
             
-            html += f"""
+            parts.append(f"""
         <div class="slide" data-frame="{i}">
-            <img src="{image_url}" alt="Frame {i+1}">
+            <img src="{escape(image_url)}" alt="Frame {i+1}">
             <div class="slide-info">
                 <h3>Frame {i+1}</h3>
-                <p>{frame.prompt[:100]}...</p>
+                <p>{escape(frame.prompt[:100])}...</p>
             </div>
             <div class="progress-bar"></div>
         </div>
-"""
+""")
         
-        html += f"""
-    </div>
-    
-    <script>
-        let currentSlide = 0;
-        const slides = document.querySelectorAll('.slide');
-        const totalSlides = slides.length;
-        const frameDuration = {frame_duration * 1000}; // Convert to milliseconds
-        
-        function showSlide(index) {{
-            slides.forEach(slide => slide.classList.remove('active'));
-            slides[index].classList.add('active');
-            
-            // Animate progress bar
-            const progressBar = slides[index].querySelector('.progress-bar');
-            progressBar.style.width = '0%';
-            setTimeout(() => {{
-                progressBar.style.width = '100%';
-            }}, 100);
-        }}
+        parts.append(_SLIDESHOW_TAIL_TMPL.format(frame_duration_ms=frame_duration * 1000))
         
-        function nextSlide() {{
-            currentSlide = (currentSlide + 1) % totalSlides;
-            showSlide(currentSlide);
-        }}
-        
-        // Start slideshow
-        showSlide(0);
-        setInterval(nextSlide, frameDuration);
-        
-        // Keyboard controls
-        document.addEventListener('keydown', (e) => {{
-            if (e.key === 'ArrowRight') {{
-                nextSlide();
-            }} else if (e.key === 'ArrowLeft') {{
-                currentSlide = (currentSlide - 1 + totalSlides) % totalSlides;
-                showSlide(currentSlide);
-            }}
-        }});
-    </script>
-</body>
-</html>
-"""
-        
-        return html
+        return "".join(parts)
     
     def _generate_nuke_script(
         self,
@@ -468,91 +900,31 @@ class ExportService(LoggerMixin):
     ) -> str:
         """Generate Nuke compositing script."""
         
-        script = f"""#! Nuke Script Generated by SceneForge
-# Project: {project.name}
-# Generated: {datetime.utcnow().isoformat()}
-# Frame Count: {len(frames)}
-
-version 13.2 v5
-define_window_layout_xml {{<?xml version="1.0" encoding="UTF-8"?>
-<layout version="1.0">
-    <window x="0" y="0" w="1920" h="1080" screen="0">
-        <splitter orientation="1">
-            <split size="1200"/>
-            <dock id="" hideTitles="1" activePageId="Viewer.1">
-                <page id="Viewer.1"/>
-            </dock>
-            <split size="720"/>
-            <dock id="" activePageId="DAG.1" focus="true">
-                <page id="DAG.1"/>
-            </dock>
-        </splitter>
-    </window>
-</layout>
-}}
-
-Root {{
- inputs 0
- name Root
- frame 1
- last_frame {len(frames)}
- format "1920 1080 0 0 1920 1080 1 HD_1080"
- proxy_type scale
- proxy_format "1024 778 0 0 1024 778 1 1K_Super_35(full-ap)"
-}}
-
-"""
+        frame_count = len(frames)
+        upload_dir = self.upload_dir
         
-        # Add Read nodes for each frame
-        for i, frame in enumerate(frames):
-            if frame.image_url and frame.image_url.startswith('/uploads/'):
-                # Convert to absolute path
-                image_path = str(self.upload_dir / frame.image_url[9:])
-                
-                script += f"""
-Read {{
- inputs 0
- file "{image_path}"
- format "1920 1080 0 0 1920 1080 1 HD_1080"
- origset true
- frame {i+1}
- name Read_Frame_{i+1:02d}
- xpos {100 + (i * 150)}
- ypos 100
-}}
-
-Text2 {{
- font_size 24
- message "Frame {i+1}: {frame.prompt[:50]}..."
- box {{0 0 1920 100}}
- xjustify center
- yjustify center
- name Text_Frame_{i+1:02d}
- xpos {100 + (i * 150)}
- ypos 200
-}}
-
-"""
+        # Fragments are joined once at the end rather than grown with +=
+        parts = [_NUKE_HEADER_TMPL.format(
+            project_name=project.name,
+            generated=datetime.utcnow().isoformat(),
+            frame_count=frame_count,
+        )]
+        
+        # Add Read and Text nodes for each stored frame
+        entries = [
+            (i + 1, str(upload_dir / frame.image_url[_UPLOAD_PREFIX_LEN:]), frame.prompt[:50])
+            for i, frame in enumerate(frames)
+            if frame.image_url and frame.image_url.startswith(_UPLOAD_PREFIX)
+        ]
+        parts.extend(
+            _NUKE_NODE_TMPL.format(n=n, path=path, prompt=prompt, xpos=100 + (n - 1) * 150)
+            for n, path, prompt in entries
+        )
         
         # Add a simple sequence viewer
-        script += f"""
-Switch {{
- inputs {len(frames)}
- which {{frame-1}}
- name FrameSequence
- xpos 500
- ypos 400
-}}
-
-Viewer {{
- frame_range 1-{len(frames)}
- name Viewer1
- xpos 500
- ypos 500
-}}
-"""
+        parts.append(_NUKE_FOOTER_TMPL.format(frame_count=frame_count))
         
-        return script
+        return "".join(parts)
     
     async def health_check(self) -> bool:
         """Check export service health."""
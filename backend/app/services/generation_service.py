@@ -3,20 +3,55 @@ Generation service - Orchestrates the complete storyboard generation process.
 """
 
 import asyncio
+import itertools
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Union
 from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
 from app.agents.orchestrator import AgentOrchestrator
+from app.core.config import settings
 from app.core.exceptions import GenerationError
 from app.core.logging import LoggerMixin
 from app.models.database import Frame, Project
-from app.models.schemas import FrameParams, Genre
-from app.services.bria_client import BriaClient
+from app.models.schemas import FrameParams, FrameParamsPatch, Genre
+from app.services.bria_client import (
+    BriaClient,
+    BriaGenerationResponse,
+    get_bria_client,
+)
 from app.services.storage_service import StorageService
 
+# Suffix for stored image filenames; each file also gets its own uuid
+# directory, so the counter only has to be unique within this process
+_file_counter = itertools.count()
+
+# Strong references to fire-and-forget tasks until they finish
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+
+async def drain_background_tasks(timeout: float) -> None:
+    """Wait up to timeout seconds for background tasks, then cancel the rest."""
+    if not _background_tasks:
+        return
+    _, pending = await asyncio.wait(set(_background_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+# Parameters stored for frames generated without any
+_DEFAULT_FRAME_PARAMS: Dict[str, Any] = {
+    "fov": 50,
+    "lighting": 60,
+    "hdr_bloom": 30,
+    "color_temp": 5500,
+    "contrast": 50,
+    "camera_angle": "eye-level",
+    "composition": "rule-of-thirds",
+}
+
 
 class GenerationService(LoggerMixin):
     """
@@ -29,9 +64,11 @@ class GenerationService(LoggerMixin):
     - Database for persistence
     """
     
-    def __init__(self) -> None:
+    def __init__(self, bria: Optional[BriaClient] = None) -> None:
         self.orchestrator = AgentOrchestrator()
         self.storage_service = StorageService()
+        # Shared by default; the client is closed by the app lifespan
+        self.bria = bria or get_bria_client()
     
     async def generate_storyboard(
         self,
@@ -118,7 +155,7 @@ class GenerationService(LoggerMixin):
         self,
         frame_id: str,
         refinement_prompt: str,
-        params: Optional[FrameParams] = None,
+        params: Optional[FrameParamsPatch] = None,
         db: Optional[Any] = None,
     ) -> Dict[str, Any]:
         """
@@ -127,7 +164,7 @@ class GenerationService(LoggerMixin):
         Args:
             frame_id: ID of frame to refine
             refinement_prompt: User feedback for refinement
-            params: Optional updated parameters
+            params: Optional parameter patch applied over the stored params
             db: Database session
             
         Returns:
@@ -146,78 +183,119 @@ class GenerationService(LoggerMixin):
             if db:
                 current_frame = db.query(DBFrame).filter(DBFrame.id == frame_id).first()
             
+            patch = params.model_dump(exclude_none=True) if params else {}
+            
             if not current_frame:
                 self.logger.warning("Frame not found in database, using default params")
-                frame_params = params or FrameParams()
+                frame_params = FrameParams.model_validate(patch)
                 original_prompt = "Scene frame"
                 structured_prompt = None
             else:
-                frame_params = FrameParams(**current_frame.params) if current_frame.params else (params or FrameParams())
+                frame_params = FrameParams.model_validate({**(current_frame.params or {}), **patch})
                 original_prompt = current_frame.prompt
                 # Structured prompt not stored in database, will be regenerated
                 structured_prompt = None
             
+            # Dumped once for the database row and the result
+            params_dict = frame_params.model_dump()
+            original_image_url = current_frame.image_url if current_frame else None
+            persistence_pending = False
+            
             # Refine image using Bria V2 API
-            async with BriaClient() as bria:
-                bria_response = await bria.refine_image(
-                    original_prompt=original_prompt,
-                    refinement_prompt=refinement_prompt,
-                    params=frame_params,
-                    structured_prompt=structured_prompt,
-                    original_image_url=current_frame.image_url if current_frame else None,
-                )
-                
-                if bria_response.image_url:
-                    # Handle mock vs real responses
-                    if bria_response.image_url == "/placeholder.svg" or not bria_response.image_url.startswith('http'):
-                        stored_url = "/placeholder.svg"
-                    else:
-                        # Real Bria API - detect format and store
-                        original_url = bria_response.image_url
-                        if '.png' in original_url.lower():
-                            extension = '.png'
-                        elif '.jpg' in original_url.lower() or '.jpeg' in original_url.lower():
-                            extension = '.jpg'
-                        elif '.webp' in original_url.lower():
-                            extension = '.webp'
-                        else:
-                            extension = '.png'
-                        
-                        # Store the refined image
-                        stored_url = await self.storage_service.store_image_from_url(
-                            bria_response.image_url,
-                            f"refined_{frame_id}_{int(datetime.utcnow().timestamp())}{extension}"
-                        )
-                    
-                    # Update frame in database if available
-                    if db and current_frame:
-                        current_frame.image_url = stored_url
-                        current_frame.prompt = f"{original_prompt} (refined: {refinement_prompt})"
-                        if params:
-                            current_frame.params = params.dict()
-                        db.commit()
-                    
-                    result = {
-                        "frame_id": frame_id,
-                        "image_url": stored_url,
-                        "prompt": f"{original_prompt} (refined: {refinement_prompt})",
-                        "parameters": frame_params.dict(),
-                        "refinement_prompt": refinement_prompt,
-                        "metadata": {
-                            "bria_id": bria_response.id,
-                            "refinement_time": datetime.utcnow().isoformat(),
-                        }
-                    }
-                    
-                    self.logger.info("Frame refinement completed", frame_id=frame_id)
-                    return result
-                else:
-                    raise GenerationError("No image URL in refinement response")
+            bria = self.bria
+            bria_response = await bria.refine_image(
+                original_prompt=original_prompt,
+                refinement_prompt=refinement_prompt,
+                params=frame_params,
+                structured_prompt=structured_prompt,
+                original_image_url=original_image_url,
+            )
+            if not bria_response.image_url:
+                raise GenerationError("No image URL in refinement response")
+            
+            bria_id = bria_response.id
+            # Handle mock vs real responses
+            if bria_response.image_url == "/placeholder.svg" or not bria_response.image_url.startswith('http'):
+                stored_url = "/placeholder.svg"
+            else:
+                # Real Bria API - serve the Bria URL right away and copy
+                # the image to local storage in the background
+                stored_url = bria_response.image_url
+                persistence_pending = True
+                task = asyncio.create_task(self._persist_refined_image(
+                    frame_id,
+                    stored_url,
+                    f"refined_{frame_id}_{next(_file_counter)}",
+                ))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            
+            # Update frame in database if available
+            if db and current_frame:
+                current_frame.image_url = stored_url
+                current_frame.prompt = f"{original_prompt} (refined: {refinement_prompt})"
+                if patch:
+                    current_frame.params = params_dict
+                db.commit()
+            
+            result = {
+                "frame_id": frame_id,
+                "image_url": stored_url,
+                "prompt": f"{original_prompt} (refined: {refinement_prompt})",
+                "parameters": params_dict,
+                "refinement_prompt": refinement_prompt,
+                "metadata": {
+                    "bria_id": bria_id,
+                    "refinement_time": datetime.utcnow().isoformat(),
+                    "persistence_pending": persistence_pending,
+                }
+            }
+            
+            self.logger.info("Frame refinement completed", frame_id=frame_id)
+            return result
             
         except Exception as e:
             self.logger.error("Frame refinement failed", frame_id=frame_id, error=str(e))
             raise GenerationError(f"Frame refinement failed: {str(e)}")
     
+    async def _persist_refined_image(
+        self,
+        frame_id: str,
+        image_url: str,
+        filename: str,
+    ) -> None:
+        """Copy a refined Bria image to local storage and repoint its frame at it.
+        
+        Runs after refine_frame has returned; on failure the frame keeps the
+        Bria URL.
+        """
+        from app.database import SessionLocal
+        from app.models.database import Frame as DBFrame
+        
+        try:
+            # Storage picks the extension from the response Content-Type
+            stored_url = await self.storage_service.store_image_from_url(image_url, filename)
+            # Failed downloads fall back to the placeholder
+            if stored_url == "/placeholder.svg":
+                self.logger.warning("Refined image not persisted", frame_id=frame_id)
+                return
+            
+            # Only repoint a frame that still shows this refinement
+            db = SessionLocal()
+            try:
+                db.query(DBFrame).filter(
+                    DBFrame.id == frame_id,
+                    DBFrame.image_url == image_url,
+                ).update({DBFrame.image_url: stored_url}, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+            
+            self.logger.info("Refined image persisted", frame_id=frame_id, url=stored_url)
+            
+        except Exception as e:
+            self.logger.error("Failed to persist refined image", frame_id=frame_id, error=str(e))
+    
     async def save_frames_to_project(
         self,
         project_id: str,
@@ -233,37 +311,24 @@ class GenerationService(LoggerMixin):
             db: Database session
         """
         try:
+            rows = []
             for i, frame_data in enumerate(frames):
-                # Handle both mock and real frame data structures
-                frame_id = frame_data.get("frame_id") or frame_data.get("id") or str(uuid4())
-                prompt = frame_data.get("prompt", "Generated scene frame")
-                image_url = frame_data.get("image_url", "/placeholder.svg")  # Use placeholder for mock
-                
-                # Handle parameters - could be nested or direct
+                # Handle both mock and real frame data structures; parameters
+                # could be nested or direct
                 params = frame_data.get("parameters", frame_data.get("params", {}))
-                if not params:
-                    # Create default parameters if none provided
-                    params = {
-                        "fov": 50,
-                        "lighting": 60,
-                        "hdr_bloom": 30,
-                        "color_temp": 5500,
-                        "contrast": 50,
-                        "camera_angle": "eye-level",
-                        "composition": "rule-of-thirds"
-                    }
-                
-                frame = Frame(
-                    id=frame_id,
-                    project_id=project_id,
-                    sequence_number=i + 1,
-                    prompt=prompt,
-                    image_url=image_url,
-                    params=params,
-                    notes=frame_data.get("notes"),
-                )
-                db.add(frame)
+                rows.append({
+                    "id": frame_data.get("frame_id") or frame_data.get("id") or str(uuid4()),
+                    "project_id": project_id,
+                    "sequence_number": i + 1,
+                    "prompt": frame_data.get("prompt", "Generated scene frame"),
+                    "image_url": frame_data.get("image_url", "/placeholder.svg"),  # Use placeholder for mock
+                    "params": params or _DEFAULT_FRAME_PARAMS,
+                    "notes": frame_data.get("notes"),
+                })
             
+            # Frame has no ORM event hooks, so the bulk path is safe; column
+            # defaults such as the timestamps still apply
+            db.bulk_insert_mappings(Frame, rows)
             db.commit()
             
             self.logger.info(
@@ -296,78 +361,91 @@ class GenerationService(LoggerMixin):
         Returns:
             Frames with generated image URLs
         """
-        frames_with_images = []
+        # Validate each agent parameter dict once, at the Bria boundary;
+        # invalid frames are recorded and skipped
+        jobs = []
+        job_frames = []
+        for frame_data in frames:
+            try:
+                job = (frame_data["prompt"], FrameParams.model_validate(frame_data["parameters"]))
+            except Exception as e:
+                self._record_frame_failure(frame_data, e)
+                continue
+            jobs.append(job)
+            job_frames.append(frame_data)
         
-        async with BriaClient() as bria:
-            for i, frame_data in enumerate(frames):
-                try:
-                    if progress_callback:
-                        await progress_callback({
-                            "step": i + 1,
-                            "total_steps": len(frames),
-                            "message": f"Generating image {i + 1}/{len(frames)}...",
-                        })
-                    
-                    # Convert parameters to FrameParams
-                    frame_params = FrameParams(**frame_data["parameters"])
-                    
-                    # Generate image with Bria FIBO
-                    bria_response = await bria.generate_image(
-                        frame_data["prompt"],
-                        frame_params,
-                    )
-                    
-                    if bria_response.image_url:
-                        # Handle mock vs real responses
-                        if bria_response.image_url == "/placeholder.svg" or not bria_response.image_url.startswith('http'):
-                            # Mock response - use placeholder but ensure it's accessible
-                            stored_url = "/placeholder.svg"
-                        else:
-                            # Real Bria API - detect format from URL and store
-                            original_url = bria_response.image_url
-                            if '.png' in original_url.lower():
-                                extension = '.png'
-                            elif '.jpg' in original_url.lower() or '.jpeg' in original_url.lower():
-                                extension = '.jpg'
-                            elif '.webp' in original_url.lower():
-                                extension = '.webp'
-                            else:
-                                extension = '.png'  # Default to PNG for real images
-                            
-                            # Store the image with correct extension
-                            filename = f"frame_{frame_data['frame_id']}_{int(datetime.utcnow().timestamp())}{extension}"
-                            stored_url = await self.storage_service.store_image_from_url(
-                                bria_response.image_url,
-                                filename
-                            )
-                        
-                        # Update frame data
-                        frame_data["image_url"] = stored_url
-                        frame_data["generation_metadata"] = {
-                            "bria_id": bria_response.id,
-                            "generation_time": datetime.utcnow().isoformat(),
-                        }
-                    else:
-                        self.logger.warning(
-                            "No image URL in Bria response",
-                            frame_id=frame_data["frame_id"],
-                        )
-                        frame_data["image_url"] = ""
-                    
-                    frames_with_images.append(frame_data)
-                    
-                except Exception as e:
-                    self.logger.error(
-                        "Failed to generate image for frame",
-                        frame_id=frame_data.get("frame_id", "unknown"),
-                        error=str(e),
-                    )
-                    # Add frame without image
-                    frame_data["image_url"] = ""
-                    frame_data["generation_error"] = str(e)
-                    frames_with_images.append(frame_data)
+        # Skipped frames count as done for progress
+        completed = len(frames) - len(jobs)
+        
+        async def _on_image(
+            index: int,
+            result: Union[BriaGenerationResponse, Exception]
+        ) -> None:
+            nonlocal completed
+            frame_data = job_frames[index]
+            if isinstance(result, Exception):
+                self._record_frame_failure(frame_data, result)
+            else:
+                await self._store_frame_image(frame_data, result)
+            completed += 1
+            if progress_callback:
+                await progress_callback({
+                    "step": completed,
+                    "total_steps": len(frames),
+                    "message": f"Generated image {completed}/{len(frames)}...",
+                })
         
-        return frames_with_images
+        # Frames are independent Bria round-trips, fanned out by the client;
+        # each is stored as soon as its own generation finishes
+        await self.bria.generate_images_batch(jobs, on_result=_on_image)
+        return frames
+    
+    async def _store_frame_image(
+        self,
+        frame_data: Dict[str, Any],
+        bria_response: BriaGenerationResponse
+    ) -> None:
+        """Store the generated image for one frame, recording any failure on it."""
+        try:
+            if bria_response.image_url:
+                # Handle mock vs real responses
+                if bria_response.image_url == "/placeholder.svg" or not bria_response.image_url.startswith('http'):
+                    # Mock response - use placeholder but ensure it's accessible
+                    stored_url = "/placeholder.svg"
+                else:
+                    # Real Bria API - storage picks the extension from the
+                    # response Content-Type
+                    filename = f"frame_{frame_data['frame_id']}_{next(_file_counter)}"
+                    stored_url = await self.storage_service.store_image_from_url(
+                        bria_response.image_url,
+                        filename
+                    )
+                
+                # Update frame data
+                frame_data["image_url"] = stored_url
+                frame_data["generation_metadata"] = {
+                    "bria_id": bria_response.id,
+                    "generation_time": datetime.utcnow().isoformat(),
+                }
+            else:
+                self.logger.warning(
+                    "No image URL in Bria response",
+                    frame_id=frame_data["frame_id"],
+                )
+                frame_data["image_url"] = ""
+            
+        except Exception as e:
+            self._record_frame_failure(frame_data, e)
+    
+    def _record_frame_failure(self, frame_data: Dict[str, Any], error: Exception) -> None:
+        """Keep a frame without an image, noting why."""
+        self.logger.error(
+            "Failed to generate image for frame",
+            frame_id=frame_data.get("frame_id", "unknown"),
+            error=str(error),
+        )
+        frame_data["image_url"] = ""
+        frame_data["generation_error"] = str(error)
     
     def _create_agent_progress_callback(
         self,
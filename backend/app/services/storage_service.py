@@ -3,9 +3,10 @@ Storage service for managing files and images.
 Production-ready with S3 support and local fallback.
 """
 
+import asyncio
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
 import aiofiles
@@ -15,6 +16,62 @@ from app.core.config import settings
 from app.core.exceptions import StorageError
 from app.core.logging import LoggerMixin
 
+# Pool for downloading generated images; HTTP/2 multiplexes concurrent
+# downloads from the same host over one connection
+_DOWNLOAD_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=30.0,
+)
+_DOWNLOAD_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Read size when streaming downloads to disk
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Payloads up to this size are written on the event loop
+_INLINE_WRITE_MAX = 64 * 1024
+
+# Content types by file extension
+_EXTENSION_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".exr": "image/x-exr",
+    ".mp4": "video/mp4",
+    ".json": "application/json",
+    ".nk": "application/octet-stream",  # Nuke script
+}
+
+# Extension for downloaded images, by response Content-Type
+_IMAGE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+}
+
+_download_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_download_client() -> httpx.AsyncClient:
+    """Return the shared download client, creating it on first use."""
+    global _download_client
+    if _download_client is None:
+        _download_client = httpx.AsyncClient(
+            http2=True,
+            limits=_DOWNLOAD_LIMITS,
+            timeout=_DOWNLOAD_TIMEOUT,
+        )
+    return _download_client
+
+
+async def close_storage_client() -> None:
+    """Close the shared download client, if one was created."""
+    global _download_client
+    if _download_client is not None:
+        client, _download_client = _download_client, None
+        await client.aclose()
+
 
 class StorageService(LoggerMixin):
     """
@@ -53,7 +110,8 @@ class StorageService(LoggerMixin):
         
         Args:
             image_url: Source image URL
-            filename: Target filename
+            filename: Target filename; without an extension, one is
+                chosen from the response Content-Type
             optimize: Whether to optimize the image
             
         Returns:
@@ -76,16 +134,17 @@ class StorageService(LoggerMixin):
                 )
                 return image_url
             
-            # Download real image
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_url)
-                response.raise_for_status()
-                
-                image_data = response.content
-                content_type = response.headers.get("content-type", "image/png")
+            # Stream the real image to disk over the shared keep-alive pool
+            file_path, relative_path, size = await self._stream_to_upload(image_url, filename)
+            
+            self.logger.info(
+                "File stored locally",
+                path=str(file_path),
+                size=size,
+                url=relative_path,
+            )
             
-            # Store the image locally
-            return await self._store_locally(image_data, filename)
+            return relative_path
                 
         except Exception as e:
             self.logger.error(
@@ -128,6 +187,45 @@ class StorageService(LoggerMixin):
     
 
     
+    def _new_upload_path(self, filename: str) -> Tuple[Path, str]:
+        """Create a unique upload directory; return the file path and its public URL."""
+        file_id = str(uuid4())
+        file_path = self.upload_dir / file_id / filename
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        return file_path, f"/uploads/{file_id}/{filename}"
+    
+    async def _stream_to_upload(self, url: str, filename: str) -> Tuple[Path, str, int]:
+        """Download a URL into a new upload in chunks, keeping memory use bounded.
+        
+        Returns the file path, its public URL and the size written.
+        """
+        file_path = None
+        size = 0
+        try:
+            async with _get_download_client().stream("GET", url) as response:
+                response.raise_for_status()
+                
+                if not Path(filename).suffix:
+                    content_type = response.headers.get("content-type", "")
+                    media_type = content_type.partition(";")[0].strip().lower()
+                    filename += _IMAGE_EXTENSIONS.get(media_type, ".png")
+                
+                file_path, relative_path = self._new_upload_path(filename)
+                async with aiofiles.open(file_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+                        size += len(chunk)
+        except BaseException:
+            # Don't leave a truncated image behind
+            if file_path is not None:
+                file_path.unlink(missing_ok=True)
+                try:
+                    file_path.parent.rmdir()
+                except OSError:
+                    pass
+            raise
+        return file_path, relative_path, size
+    
     async def _store_locally(
         self,
         file_data: bytes,
@@ -135,17 +233,15 @@ class StorageService(LoggerMixin):
     ) -> str:
         """Store file locally."""
         try:
-            # Generate unique path
-            file_id = str(uuid4())
-            file_path = self.upload_dir / file_id / filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(file_data)
+            file_path, relative_path = self._new_upload_path(filename)
             
-            # Return relative URL
-            relative_path = f"/uploads/{file_id}/{filename}"
+            if len(file_data) <= _INLINE_WRITE_MAX:
+                # Small writes finish faster than a thread handoff
+                file_path.write_bytes(file_data)
+            else:
+                # One worker-thread hop for open + write + close; aiofiles
+                # would take a separate hop for each
+                await asyncio.to_thread(file_path.write_bytes, file_data)
             
             self.logger.info(
                 "File stored locally",
@@ -269,17 +365,7 @@ class StorageService(LoggerMixin):
     
     def _guess_content_type(self, extension: str) -> str:
         """Guess content type from file extension."""
-        content_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".exr": "image/x-exr",
-            ".mp4": "video/mp4",
-            ".json": "application/json",
-            ".nk": "application/octet-stream",  # Nuke script
-        }
-        
-        return content_types.get(extension.lower(), "application/octet-stream")
+        return _EXTENSION_CONTENT_TYPES.get(extension.lower(), "application/octet-stream")
     
     async def health_check(self) -> bool:
         """Check storage service health."""
@@ -3,13 +3,176 @@ Surprise service - Uses Gemini AI to generate creative scene suggestions.
 """
 
 import asyncio
-import json
 import random
-from typing import Any, Dict, List
+import re
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+import orjson
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from app.core.config import settings
 from app.core.logging import LoggerMixin
-from app.models.schemas import Genre
+from app.models.schemas import CAMERA_ANGLES, COMPOSITIONS, GENRE_BY_VALUE
+
+# Creative-director prompt; {genre} and {style} are filled per request
+_SCENE_PROMPT_TEMPLATE = """\
+You are a creative director for a {genre} film with {style} visual style.
+
+Generate a unique, visually striking scene description that would make an excellent storyboard frame.
+The scene should be:
+- Highly visual and cinematic
+- Appropriate for {genre} genre
+- Rich in atmospheric details
+- Suitable for {style} cinematography
+
+Also suggest appropriate camera parameters:
+- Field of view (24-120 degrees)
+- Lighting intensity (0-100%)
+- HDR bloom (0-100%)
+- Color temperature (2700-10000K)
+- Contrast (0-100%)
+- Camera angle (eye-level, low-angle, high-angle, dutch-angle, birds-eye, worms-eye)
+- Composition (rule-of-thirds, centered, leading-lines, symmetrical)
+
+Respond in JSON format:
+{{
+    "scene_description": "detailed scene description",
+    "genre": "{genre}",
+    "suggested_params": {{
+        "fov": number,
+        "lighting": number,
+        "hdrBloom": number,
+        "colorTemp": number,
+        "contrast": number,
+        "cameraAngle": "string",
+        "composition": "string"
+    }}
+}}
+"""
+
+# Outermost {...} span of a Gemini reply
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+# Values accepted from Gemini's suggested params
+_VALID_CAMERA_ANGLES = frozenset(CAMERA_ANGLES)
+_VALID_COMPOSITIONS = frozenset(COMPOSITIONS)
+
+# Curated-suggestion building blocks
+_SCENE_VARIATIONS = (
+    "bathed in ethereal moonlight",
+    "with dramatic chiaroscuro lighting",
+    "as storm clouds gather overhead",
+    "reflected in shattered mirrors",
+    "through swirling mist and fog",
+    "with sparks of magical energy",
+    "under the glow of neon signs",
+    "as shadows dance on ancient walls",
+)
+_CURATED_CAMERA_ANGLES = ("eye-level", "low-angle", "high-angle", "dutch-angle")
+_CURATED_COMPOSITIONS = ("rule-of-thirds", "centered", "leading-lines", "symmetrical")
+_CURATED_NUMERIC_PARAMS = ("fov", "lighting", "hdrBloom", "colorTemp", "contrast")
+
+_gemini_model: Optional[Any] = None
+
+# Process-wide Gemini limits, shared by the per-request service instances
+_gemini_slots = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+# Bounded to the cap: appending past it drops the oldest timestamp
+_gemini_request_times: Deque[float] = deque(maxlen=settings.GEMINI_REQUESTS_PER_MINUTE)
+_gemini_rate_limit_lock = asyncio.Lock()
+
+# Gemini attempts per suggestion before falling back to curated
+_GEMINI_MAX_ATTEMPTS = 3
+
+
+def _is_retryable_gemini_error(exc: BaseException) -> bool:
+    """Retry 429s, 5xx, timeouts and dropped connections; other errors are final."""
+    # Already loaded by the time a call fails, via google.generativeai
+    from google.api_core import exceptions as google_exceptions
+    
+    return isinstance(exc, (
+        google_exceptions.ServerError,
+        google_exceptions.TooManyRequests,
+        asyncio.TimeoutError,
+        ConnectionError,
+    ))
+
+# Recent Gemini scenes per (genre, style); once a pool is full, most requests
+# are answered from it and the rest refresh it. Only known genre/style pairs
+# get a pool, so request input cannot grow this.
+_SCENE_POOL_SIZE = 8
+_SCENE_POOL_TTL = 3600
+_SCENE_POOL_REUSE_PROBABILITY = 0.7
+
+_scene_pools: Dict[Tuple[str, str], Deque[Tuple[float, Dict[str, Any]]]] = {}
+
+
+def _scene_pool_key(genre: Any, style_preference: Any) -> Optional[Tuple[str, str]]:
+    """Pool key for a known genre and style, else None."""
+    if not isinstance(genre, str) or not isinstance(style_preference, str):
+        return None
+    if genre not in GENRE_BY_VALUE or style_preference not in SurpriseService.parameter_styles:
+        return None
+    return (genre, style_preference)
+
+
+def _pool_scene(genre: str, style_preference: str, scene: Dict[str, Any]) -> None:
+    """Add a validated Gemini scene to its pool, if the pair is poolable."""
+    key = _scene_pool_key(genre, style_preference)
+    if key is None:
+        return
+    pool = _scene_pools.get(key)
+    if pool is None:
+        pool = _scene_pools[key] = deque(maxlen=_SCENE_POOL_SIZE)
+    pool.append((time.monotonic(), scene))
+
+
+def _pooled_scenes(genre: Any, style_preference: Any, count: int) -> List[Dict[str, Any]]:
+    """Up to count distinct pooled scenes; the rest should come from Gemini."""
+    key = _scene_pool_key(genre, style_preference)
+    pool = _scene_pools.get(key) if key is not None else None
+    if not pool:
+        return []
+    
+    # Entries are appended in time order, so expired ones sit on the left
+    expires_before = time.monotonic() - _SCENE_POOL_TTL
+    while pool and pool[0][0] < expires_before:
+        pool.popleft()
+    
+    if len(pool) < _SCENE_POOL_SIZE:
+        return []
+    
+    # Each slot is reused with the pool's probability; sampling without
+    # replacement keeps one batch free of repeats
+    rand = random.random
+    reused = sum(rand() < _SCENE_POOL_REUSE_PROBABILITY for _ in range(count))
+    return [
+        {**scene, "suggested_params": dict(scene["suggested_params"])}
+        for _, scene in random.sample(pool, min(reused, len(pool)))
+    ]
+
+
+def _get_gemini_model() -> Any:
+    """Return the shared Gemini model, configuring the SDK on first use.
+    
+    SurpriseService is created per request, so the configured model (and its
+    client's connection pool) lives at module scope.
+    """
+    global _gemini_model
+    if _gemini_model is None:
+        import google.generativeai as genai
+        
+        genai.configure(api_key=settings.GOOGLE_API_KEY)
+        _gemini_model = genai.GenerativeModel('gemini-2.5-flash')
+    return _gemini_model
 
 
 class SurpriseService(LoggerMixin):
@@ -23,75 +186,75 @@ class SurpriseService(LoggerMixin):
     - Fallback to curated suggestions if AI unavailable
     """
     
-    def __init__(self) -> None:
-        self.creative_templates = {
-            "noir": [
-                "A mysterious figure in a fedora walks through rain-soaked streets",
-                "Smoke curls from a cigarette in a dimly lit detective's office",
-                "Shadows dance across venetian blinds as footsteps echo in the hallway",
-                "A femme fatale emerges from the fog at midnight",
-                "Neon signs reflect in puddles on empty city streets"
-            ],
-            "scifi": [
-                "A lone astronaut discovers an ancient alien artifact",
-                "Holographic displays flicker in a futuristic command center",
-                "A spaceship approaches a mysterious planet with twin moons",
-                "Robots patrol the corridors of an abandoned space station",
-                "Energy beams pierce through the darkness of deep space"
-            ],
-            "horror": [
-                "A creaking door slowly opens in an abandoned mansion",
-                "Shadows move independently in the flickering candlelight",
-                "Fog rolls across an ancient cemetery at midnight",
-                "A figure watches from the window of a haunted house",
-                "Strange symbols glow on the walls of a dark ritual chamber"
-            ],
-            "action": [
-                "An explosion erupts behind a running figure",
-                "A motorcycle chase winds through narrow city streets",
-                "Sparks fly as metal clashes against metal in combat",
-                "A helicopter hovers over a rooftop pursuit",
-                "Bullets shatter glass in a high-speed gunfight"
-            ],
-            "fantasy": [
-                "A dragon soars over misty mountain peaks",
-                "Ancient runes glow with magical energy in a forgotten temple",
-                "A wizard conjures swirling portals of mystical light",
-                "Ethereal creatures dance in an enchanted forest",
-                "A knight stands before a towering castle gate"
-            ],
-            "western": [
-                "A lone gunslinger walks down a dusty main street",
-                "Tumbleweeds roll past a weathered saloon",
-                "A stagecoach races across the desert landscape",
-                "Smoke rises from a campfire under the starlit sky",
-                "A sheriff's badge glints in the harsh desert sun"
-            ]
-        }
-        
-        self.parameter_styles = {
-            "dramatic": {
-                "fov": (24, 50),
-                "lighting": (20, 40),
-                "hdrBloom": (40, 80),
-                "contrast": (60, 85),
-                "colorTemp": (2700, 4000)
-            },
-            "cinematic": {
-                "fov": (35, 85),
-                "lighting": (30, 70),
-                "hdrBloom": (20, 60),
-                "contrast": (45, 75),
-                "colorTemp": (3200, 6500)
-            },
-            "ethereal": {
-                "fov": (50, 120),
-                "lighting": (60, 90),
-                "hdrBloom": (60, 100),
-                "contrast": (30, 60),
-                "colorTemp": (5000, 8000)
-            }
-        }
+    # Immutable catalogues, shared by every instance
+    creative_templates: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+        "noir": (
+            "A mysterious figure in a fedora walks through rain-soaked streets",
+            "Smoke curls from a cigarette in a dimly lit detective's office",
+            "Shadows dance across venetian blinds as footsteps echo in the hallway",
+            "A femme fatale emerges from the fog at midnight",
+            "Neon signs reflect in puddles on empty city streets"
+        ),
+        "scifi": (
+            "A lone astronaut discovers an ancient alien artifact",
+            "Holographic displays flicker in a futuristic command center",
+            "A spaceship approaches a mysterious planet with twin moons",
+            "Robots patrol the corridors of an abandoned space station",
+            "Energy beams pierce through the darkness of deep space"
+        ),
+        "horror": (
+            "A creaking door slowly opens in an abandoned mansion",
+            "Shadows move independently in the flickering candlelight",
+            "Fog rolls across an ancient cemetery at midnight",
+            "A figure watches from the window of a haunted house",
+            "Strange symbols glow on the walls of a dark ritual chamber"
+        ),
+        "action": (
+            "An explosion erupts behind a running figure",
+            "A motorcycle chase winds through narrow city streets",
+            "Sparks fly as metal clashes against metal in combat",
+            "A helicopter hovers over a rooftop pursuit",
+            "Bullets shatter glass in a high-speed gunfight"
+        ),
+        "fantasy": (
+            "A dragon soars over misty mountain peaks",
+            "Ancient runes glow with magical energy in a forgotten temple",
+            "A wizard conjures swirling portals of mystical light",
+            "Ethereal creatures dance in an enchanted forest",
+            "A knight stands before a towering castle gate"
+        ),
+        "western": (
+            "A lone gunslinger walks down a dusty main street",
+            "Tumbleweeds roll past a weathered saloon",
+            "A stagecoach races across the desert landscape",
+            "Smoke rises from a campfire under the starlit sky",
+            "A sheriff's badge glints in the harsh desert sun"
+        )
+    })
+    
+    parameter_styles: Mapping[str, Mapping[str, Tuple[int, int]]] = MappingProxyType({
+        "dramatic": MappingProxyType({
+            "fov": (24, 50),
+            "lighting": (20, 40),
+            "hdrBloom": (40, 80),
+            "contrast": (60, 85),
+            "colorTemp": (2700, 4000)
+        }),
+        "cinematic": MappingProxyType({
+            "fov": (35, 85),
+            "lighting": (30, 70),
+            "hdrBloom": (20, 60),
+            "contrast": (45, 75),
+            "colorTemp": (3200, 6500)
+        }),
+        "ethereal": MappingProxyType({
+            "fov": (50, 120),
+            "lighting": (60, 90),
+            "hdrBloom": (60, 100),
+            "contrast": (30, 60),
+            "colorTemp": (5000, 8000)
+        })
+    })
     
     async def generate_creative_scene(
         self,
@@ -108,14 +271,56 @@ class SurpriseService(LoggerMixin):
         Returns:
             Creative scene suggestion with parameters
         """
+        if not settings.GOOGLE_API_KEY:
+            self.logger.warning("Google API key not configured, using curated suggestions")
+            return self._generate_curated_suggestion(current_genre, style_preference)
+        
+        pooled = _pooled_scenes(current_genre, style_preference, 1)
+        if pooled:
+            return pooled[0]
+        
+        return await self._generate_fresh_scene(current_genre, style_preference)
+    
+    async def generate_creative_scenes(
+        self,
+        count: int,
+        current_genre: str = "noir",
+        style_preference: str = "cinematic"
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate several independent scene suggestions concurrently.
+        
+        Args:
+            count: Number of suggestions
+            current_genre: Current selected genre
+            style_preference: Visual style preference
+            
+        Returns:
+            Creative scene suggestions, one per request
+        """
+        if not settings.GOOGLE_API_KEY:
+            self.logger.warning("Google API key not configured, using curated suggestions")
+            return [
+                self._generate_curated_suggestion(current_genre, style_preference)
+                for _ in range(count)
+            ]
+        
+        # Pooled scenes are drawn together so the batch has no duplicates
+        suggestions = _pooled_scenes(current_genre, style_preference, count)
+        suggestions.extend(await asyncio.gather(*(
+            self._generate_fresh_scene(current_genre, style_preference)
+            for _ in range(count - len(suggestions))
+        )))
+        return suggestions
+    
+    async def _generate_fresh_scene(
+        self,
+        current_genre: str,
+        style_preference: str
+    ) -> Dict[str, Any]:
+        """Ask Gemini for a new scene, falling back to a curated one."""
         try:
-            # Try to use Gemini AI for creative generation
-            if settings.GOOGLE_API_KEY and settings.GOOGLE_API_KEY != "":
-                return await self._generate_with_gemini(current_genre, style_preference)
-            else:
-                self.logger.warning("Google API key not configured, using curated suggestions")
-                return self._generate_curated_suggestion(current_genre, style_preference)
-                
+            return await self._generate_with_gemini(current_genre, style_preference)
         except Exception as e:
             self.logger.error("Failed to generate creative scene with AI", error=str(e))
             return self._generate_curated_suggestion(current_genre, style_preference)
@@ -127,66 +332,42 @@ class SurpriseService(LoggerMixin):
     ) -> Dict[str, Any]:
         """Generate creative scene using Gemini AI."""
         try:
-            import google.generativeai as genai
-            
-            # Configure Gemini
-            genai.configure(api_key=settings.GOOGLE_API_KEY)
-            model = genai.GenerativeModel('gemini-2.5-flash')
+            model = _get_gemini_model()
             
             # Create creative prompt for Gemini
-            prompt = f"""
-            You are a creative director for a {current_genre} film with {style_preference} visual style.
-            
-            Generate a unique, visually striking scene description that would make an excellent storyboard frame.
-            The scene should be:
-            - Highly visual and cinematic
-            - Appropriate for {current_genre} genre
-            - Rich in atmospheric details
-            - Suitable for {style_preference} cinematography
-            
-            Also suggest appropriate camera parameters:
-            - Field of view (24-120 degrees)
-            - Lighting intensity (0-100%)
-            - HDR bloom (0-100%)
-            - Color temperature (2700-10000K)
-            - Contrast (0-100%)
-            - Camera angle (eye-level, low-angle, high-angle, dutch-angle, birds-eye, worms-eye)
-            - Composition (rule-of-thirds, centered, leading-lines, symmetrical)
-            
-            Respond in JSON format:
-            {{
-                "scene_description": "detailed scene description",
-                "genre": "{current_genre}",
-                "suggested_params": {{
-                    "fov": number,
-                    "lighting": number,
-                    "hdrBloom": number,
-                    "colorTemp": number,
-                    "contrast": number,
-                    "cameraAngle": "string",
-                    "composition": "string"
-                }}
-            }}
-            """
+            prompt = _SCENE_PROMPT_TEMPLATE.format_map(
+                {"genre": current_genre, "style": style_preference}
+            )
             
-            # Generate with Gemini
-            response = model.generate_content(prompt)
+            # Transient failures are retried before falling back to curated
+            retrying = AsyncRetrying(
+                stop=stop_after_attempt(_GEMINI_MAX_ATTEMPTS),
+                wait=wait_exponential_jitter(initial=0.2, max=2, jitter=0.1),
+                retry=retry_if_exception(_is_retryable_gemini_error),
+                before_sleep=self._log_retry,
+                reraise=True,
+            )
+            response = await retrying(self._call_gemini, model, prompt)
             
             # Parse JSON response
             try:
-                # Extract JSON from response
-                response_text = response.text.strip()
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:-3]
-                elif response_text.startswith('```'):
-                    response_text = response_text[3:-3]
+                # Extract the JSON object, with or without a Markdown fence
+                match = _JSON_OBJECT.search(response.text)
+                if match is None:
+                    raise orjson.JSONDecodeError("No JSON object in response", response.text, 0)
                 
-                result = json.loads(response_text)
+                result = orjson.loads(match.group(0))
                 
                 # Validate and sanitize the response
-                return self._validate_gemini_response(result, current_genre, style_preference)
+                validated = self._validate_gemini_response(result, current_genre, style_preference)
                 
-            except json.JSONDecodeError:
+                # Only scenes that passed validation are pooled, not the
+                # curated fallback
+                if validated["scene_description"] == result.get("scene_description"):
+                    _pool_scene(current_genre, style_preference, validated)
+                return validated
+                
+            except orjson.JSONDecodeError:
                 self.logger.warning("Failed to parse Gemini JSON response, using curated suggestion")
                 return self._generate_curated_suggestion(current_genre, style_preference)
                 
@@ -194,6 +375,45 @@ class SurpriseService(LoggerMixin):
             self.logger.error("Gemini AI generation failed", error=str(e))
             return self._generate_curated_suggestion(current_genre, style_preference)
     
+    async def _call_gemini(self, model: Any, prompt: str) -> Any:
+        """Make one Gemini request within the process-wide limits."""
+        # Generate with Gemini without blocking the event loop; bursts
+        # queue here instead of turning into 429s and curated fallbacks
+        async with _gemini_slots:
+            await self._enforce_rate_limit()
+            return await model.generate_content_async(prompt)
+    
+    def _log_retry(self, retry_state: RetryCallState) -> None:
+        """Log a failed attempt before tenacity sleeps."""
+        self.logger.warning(
+            "Gemini request failed, retrying",
+            attempt=retry_state.attempt_number,
+            wait_time=retry_state.next_action.sleep,
+            error=str(retry_state.outcome.exception())
+        )
+    
+    async def _enforce_rate_limit(self) -> None:
+        """Keep Gemini calls within the per-minute quota without blocking the event loop."""
+        # Slots are reserved in arrival order under the lock; the wait for a
+        # reserved slot happens after releasing it
+        async with _gemini_rate_limit_lock:
+            now = time.monotonic()
+            
+            # Remove requests older than 1 minute
+            while _gemini_request_times and now - _gemini_request_times[0] >= 60:
+                _gemini_request_times.popleft()
+            
+            # At the limit, the next slot opens when the oldest request expires
+            slot = now
+            if len(_gemini_request_times) >= settings.GEMINI_REQUESTS_PER_MINUTE:
+                slot = _gemini_request_times[0] + 60
+            _gemini_request_times.append(slot)
+        
+        sleep_time = slot - now
+        if sleep_time > 0:
+            self.logger.warning("Gemini rate limit reached, sleeping", sleep_time=sleep_time)
+            await asyncio.sleep(sleep_time)
+    
     def _validate_gemini_response(
         self,
         response: Dict[str, Any],
@@ -209,20 +429,25 @@ class SurpriseService(LoggerMixin):
             
             # Validate genre
             genre = response.get("genre", fallback_genre)
-            valid_genres = [g.value for g in Genre]
-            if genre not in valid_genres:
+            if genre not in GENRE_BY_VALUE:
                 genre = fallback_genre
             
             # Validate parameters
             params = response.get("suggested_params", {})
+            camera_angle = params.get("cameraAngle", "eye-level")
+            if camera_angle not in _VALID_CAMERA_ANGLES:
+                camera_angle = "eye-level"
+            composition = params.get("composition", "rule-of-thirds")
+            if composition not in _VALID_COMPOSITIONS:
+                composition = "rule-of-thirds"
             validated_params = {
                 "fov": max(24, min(120, params.get("fov", 50))),
                 "lighting": max(0, min(100, params.get("lighting", 50))),
                 "hdrBloom": max(0, min(100, params.get("hdrBloom", 30))),
                 "colorTemp": max(2700, min(10000, params.get("colorTemp", 5500))),
                 "contrast": max(0, min(100, params.get("contrast", 50))),
-                "cameraAngle": params.get("cameraAngle", "eye-level"),
-                "composition": params.get("composition", "rule-of-thirds")
+                "cameraAngle": camera_angle,
+                "composition": composition
             }
             
             return {
@@ -242,36 +467,31 @@ class SurpriseService(LoggerMixin):
     ) -> Dict[str, Any]:
         """Generate curated creative suggestion as fallback."""
         
+        # Every draw scales one random() float; randint/choice add range
+        # checks and rejection sampling that this path doesn't need
+        rand = random.random
+        
         # Get genre templates
         templates = self.creative_templates.get(genre, self.creative_templates["noir"])
-        base_scene = random.choice(templates)
+        base_scene = templates[int(rand() * len(templates))]
         
         # Add creative variations
-        variations = [
-            "bathed in ethereal moonlight",
-            "with dramatic chiaroscuro lighting",
-            "as storm clouds gather overhead",
-            "reflected in shattered mirrors",
-            "through swirling mist and fog",
-            "with sparks of magical energy",
-            "under the glow of neon signs",
-            "as shadows dance on ancient walls"
-        ]
-        
-        enhanced_scene = f"{base_scene} {random.choice(variations)}"
+        variation = _SCENE_VARIATIONS[int(rand() * len(_SCENE_VARIATIONS))]
+        enhanced_scene = f"{base_scene} {variation}"
         
         # Generate style-appropriate parameters
         style_ranges = self.parameter_styles.get(style_preference, self.parameter_styles["cinematic"])
         
-        suggested_params = {
-            "fov": random.randint(*style_ranges["fov"]),
-            "lighting": random.randint(*style_ranges["lighting"]),
-            "hdrBloom": random.randint(*style_ranges["hdrBloom"]),
-            "colorTemp": random.randint(*style_ranges["colorTemp"]),
-            "contrast": random.randint(*style_ranges["contrast"]),
-            "cameraAngle": random.choice(["eye-level", "low-angle", "high-angle", "dutch-angle"]),
-            "composition": random.choice(["rule-of-thirds", "centered", "leading-lines", "symmetrical"])
-        }
+        suggested_params = {}
+        for key in _CURATED_NUMERIC_PARAMS:
+            low, high = style_ranges[key]
+            suggested_params[key] = low + int(rand() * (high - low + 1))
+        suggested_params["cameraAngle"] = _CURATED_CAMERA_ANGLES[
+            int(rand() * len(_CURATED_CAMERA_ANGLES))
+        ]
+        suggested_params["composition"] = _CURATED_COMPOSITIONS[
+            int(rand() * len(_CURATED_COMPOSITIONS))
+        ]
         
         return {
             "scene_description": enhanced_scene,
@@ -281,10 +501,7 @@ class SurpriseService(LoggerMixin):
     
     async def health_check(self) -> bool:
         """Check if surprise service is healthy."""
-        try:
-            # Test curated generation
-            result = self._generate_curated_suggestion("noir", "cinematic")
-            return bool(result.get("scene_description"))
-        except Exception as e:
-            self.logger.error("Surprise service health check failed", error=str(e))
-            return False
\ No newline at end of file
+        # The curated fallback can serve as long as its default data is present
+        return bool(self.creative_templates.get("noir")) and bool(
+            self.parameter_styles.get("cinematic")
+        )
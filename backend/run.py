@@ -6,6 +6,7 @@ Production-ready startup with proper error handling.
 
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,6 +15,9 @@ load_dotenv()
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
+# Checked by find_spec, so their (heavy) module code is not run at startup
+REQUIRED_MODULES = ("fastapi", "uvicorn", "sqlalchemy", "langchain")
+
 
 def get_env(key: str, default: str | None = None) -> str | None:
     return os.getenv(key, default)
@@ -63,18 +67,14 @@ def setup_environment() -> dict:
 
 
 def check_dependencies():
-    """Check if required dependencies are installed."""
-    try:
-        import fastapi
-        import uvicorn
-        import sqlalchemy
-        import langchain
-        print("✅ All dependencies installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    """Check if required dependencies are installed, without importing them."""
+    missing = [name for name in REQUIRED_MODULES if find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependencies: {', '.join(missing)}")
         print("Run: pip install -r requirements.txt")
         return False
+    print("✅ All dependencies installed")
+    return True
 
 if __name__ == "__main__":
     print("🎬 SceneForge Backend - Agentic Pre-Vis Pipeline")
@@ -85,13 +85,6 @@ if __name__ == "__main__":
     CONFIG = setup_environment()
 
     print(f"Config {CONFIG}")
-    if not CONFIG["BRIA_API_KEY"]:
-        print("⚠️  Warning: BRIA_API_KEY not set. Using mock responses for image generation.")
-
-    if not CONFIG["GOOGLE_API_KEY"]:
-        print("⚠️  Warning: GOOGLE_API_KEY not set. Using mock responses for AI agents.")
-
-
     
     if not check_dependencies():
         sys.exit(1)
@@ -12,26 +12,35 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
+# Set minimal environment before the app reads its settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-at-least-32-characters-long")
+os.environ.setdefault("BRIA_API_KEY", "test-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("DEBUG", "true")
+
+# Import once at module scope so failures surface before the event loop starts
+try:
+    from app.core.config import settings
+    from app.core.logging import configure_logging, get_logger
+    from app.models.schemas import SceneGenerationRequest, Genre, FrameParams
+    from app.agents.orchestrator import AgentOrchestrator
+    from app.services.bria_client import BriaClient
+    from app.database import create_tables
+    SKIP_REASON = None
+except ImportError as e:
+    SKIP_REASON = f"backend imports failed ({e})"
+
 async def test_basic_functionality():
     """Test basic backend functionality."""
     print("🧪 Testing SceneForge Backend...")
     
-    # Set minimal environment
-    os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
-    os.environ.setdefault("SECRET_KEY", "test-secret-key-at-least-32-characters-long")
-    os.environ.setdefault("BRIA_API_KEY", "test-key")
-    os.environ.setdefault("OPENAI_API_KEY", "test-key")
-    os.environ.setdefault("DEBUG", "true")
-    
     try:
-        # Test imports
-        print("✅ Testing imports...")
-        from app.core.config import settings
-        from app.core.logging import configure_logging, get_logger
-        from app.models.schemas import SceneGenerationRequest, Genre, FrameParams
-        from app.agents.orchestrator import AgentOrchestrator
-        from app.services.bria_client import BriaClient
-        from app.database import create_tables
+        # Imports ran at module load; report the outcome here
+        if SKIP_REASON is not None:
+            print(f"⏭️  Skipping tests: {SKIP_REASON}")
+            return False
+        print("✅ Imports loaded")
         
         print(f"✅ Configuration loaded: {settings.APP_NAME} v{settings.APP_VERSION}")
         
@@ -65,12 +74,7 @@ async def test_basic_functionality():
         
         # Test agent orchestrator (without actual API calls)
         print("✅ Testing agent orchestrator...")
-        try:
-            from app.agents.orchestrator import AgentOrchestrator
-            print("✅ Orchestrator class imported successfully")
-        except Exception as e:
-            print(f"⚠️  Orchestrator import warning: {e}")
-            print("✅ This is expected without proper OpenAI configuration")
+        print(f"✅ Orchestrator class imported: {AgentOrchestrator.__name__}")
         
         print("\n🎉 All basic tests passed!")
         print("🚀 Backend is ready for development")
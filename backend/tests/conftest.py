@@ -0,0 +1,23 @@
+"""
+Shared test setup: an isolated environment, configured before the app loads.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Settings are read at import time, so this must run before any app import.
+# API keys are blanked explicitly so a local .env never sends real requests.
+_test_dir = Path(tempfile.mkdtemp(prefix="sceneforge-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_test_dir / 'test.db'}"
+os.environ["UPLOAD_DIR"] = str(_test_dir / "uploads")
+os.environ["EXPORT_CACHE_DIR"] = str(_test_dir / "export_cache")
+os.environ["GOOGLE_API_KEY"] = ""
+os.environ["BRIA_API_KEY"] = ""
+os.environ.setdefault("SECRET_KEY", "test-secret-key-at-least-32-characters-long")
+os.environ["DEBUG"] = "false"
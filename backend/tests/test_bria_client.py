@@ -0,0 +1,186 @@
+"""
+Tests for the Bria client: rate limiting, status polling and response caching.
+"""
+
+import asyncio
+from collections import deque
+
+import httpx
+import pytest
+
+from app.core.exceptions import BriaAPIError
+from app.models.schemas import FrameParams
+from app.services import bria_client
+from app.services.bria_client import BriaClient, ResponseCache
+
+STATUS_URL = "https://bria.test/v2/status/job-1"
+
+
+def _client_with_transport(handler, max_requests_per_minute=20):
+    client = BriaClient(cache=ResponseCache())
+    client.api_key = "test-key"
+    client.client = httpx.AsyncClient(
+        base_url="https://bria.test",
+        transport=httpx.MockTransport(handler),
+    )
+    client._max_requests_per_minute = max_requests_per_minute
+    client._request_times = deque(maxlen=max_requests_per_minute)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_status_polls_skip_rate_limit_and_inflight_slots(monkeypatch):
+    monkeypatch.setattr(bria_client, "_poll_interval", lambda poll_count: 0)
+    polls = []
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(202, json={"status_url": STATUS_URL})
+        # Record the client state seen by each status poll
+        polls.append((len(client._request_times), client._inflight._value))
+        if len(polls) < 3:
+            return httpx.Response(200, json={"status": "IN_PROGRESS"})
+        return httpx.Response(200, json={
+            "status": "COMPLETED",
+            "result": {"request_id": "job-1", "image_url": "https://bria.test/job-1.png"},
+        })
+
+    client = _client_with_transport(handler)
+    try:
+        response = await client.generate_image("A rainy alley", FrameParams())
+    finally:
+        await client.close()
+
+    assert response.image_url == "https://bria.test/job-1.png"
+    # Only the submission spends the per-minute budget
+    assert len(client._request_times) == 1
+    # Every poll ran with all in-flight slots free
+    assert polls == [(1, client._max_requests_per_minute)] * 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_caller_sleeps_without_holding_the_lock():
+    client = _client_with_transport(lambda request: httpx.Response(200), max_requests_per_minute=1)
+    try:
+        await client._enforce_rate_limit()
+        first = client._request_times[0]
+
+        # The window is full, so this caller has to wait about a minute
+        waiter = asyncio.create_task(client._enforce_rate_limit())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert not client._rate_limit_lock.locked()
+
+        # Its slot was reserved one window after the first request
+        assert list(client._request_times) == [pytest.approx(first + 60)]
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_unseeded_generations_are_not_cached(monkeypatch):
+    monkeypatch.setattr(bria_client, "_poll_interval", lambda poll_count: 0)
+    submissions = []
+
+    def handler(request):
+        submissions.append(request)
+        index = len(submissions)
+        return httpx.Response(200, json={
+            "id": f"job-{index}",
+            "status": "completed",
+            "image_url": f"https://bria.test/job-{index}.png",
+        })
+
+    client = _client_with_transport(handler)
+    try:
+        params = FrameParams()
+        first = await client.generate_image("A rainy alley", params)
+        second = await client.generate_image("A rainy alley", params)
+        seeded = await client.generate_image("A rainy alley", params, seed=7)
+        seeded_again = await client.generate_image("A rainy alley", params, seed=7)
+    finally:
+        await client.close()
+
+    assert first.image_url != second.image_url
+    assert seeded.image_url == seeded_again.image_url
+    assert len(submissions) == 3
+
+
+def _slow_generation_handler(submissions):
+    async def handler(request):
+        submissions.append(request)
+        index = len(submissions)
+        # Keep the request in flight long enough for the others to arrive
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={
+            "id": f"job-{index}",
+            "status": "completed",
+            "image_url": f"https://bria.test/job-{index}.png",
+        })
+
+    return handler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "first_kwargs, second_kwargs",
+    [
+        ({}, {}),
+        ({"seed": 7}, {"seed": 7, "bypass_cache": True}),
+    ],
+)
+async def test_unshareable_concurrent_generations_are_not_coalesced(first_kwargs, second_kwargs):
+    submissions = []
+    client = _client_with_transport(_slow_generation_handler(submissions))
+    try:
+        params = FrameParams()
+        first, second = await asyncio.gather(
+            client.generate_image("A rainy alley", params, **first_kwargs),
+            client.generate_image("A rainy alley", params, **second_kwargs),
+        )
+    finally:
+        await client.close()
+
+    assert len(submissions) == 2
+    assert first.image_url != second.image_url
+
+
+@pytest.mark.asyncio
+async def test_identical_seeded_generations_in_flight_are_coalesced():
+    submissions = []
+    client = _client_with_transport(_slow_generation_handler(submissions))
+    try:
+        params = FrameParams()
+        results = await asyncio.gather(*(
+            client.generate_image("A rainy alley", params, seed=7) for _ in range(3)
+        ))
+    finally:
+        await client.close()
+
+    assert len(submissions) == 1
+    assert {result.image_url for result in results} == {"https://bria.test/job-1.png"}
+
+
+@pytest.mark.parametrize(
+    "error_code, status_code, expected",
+    [
+        ("REQUEST_ERROR", None, True),
+        ("HTTP_ERROR", 408, True),
+        ("HTTP_ERROR", 429, True),
+        ("HTTP_ERROR", 503, True),
+        ("HTTP_ERROR", 400, False),
+        ("HTTP_ERROR", 404, False),
+        ("GENERATION_FAILED", None, False),
+        ("STATUS_URL_NOT_FOUND", None, False),
+        ("TIMEOUT", None, False),
+    ],
+)
+def test_retry_decision_follows_error_code(error_code, status_code, expected):
+    details = {"status_code": status_code} if status_code is not None else None
+    error = BriaAPIError("Bria failed", error_code=error_code, details=details)
+
+    assert bria_client._is_retryable(error) is expected
@@ -0,0 +1,54 @@
+"""
+Tests for the orjson serializer behind JSON columns.
+"""
+
+import json
+from datetime import datetime, timezone
+from uuid import UUID
+
+from app.database import SessionLocal, _json_serializer, create_tables
+from app.models.database import Frame, Project
+from app.models.schemas import Genre
+
+
+def test_json_serializer_matches_json_dumps_for_non_string_keys():
+    value = {1: "one", 2.5: [True, None], "nested": {3: 4}}
+
+    assert json.loads(_json_serializer(value)) == json.loads(json.dumps(value))
+
+
+def test_json_serializer_encodes_datetimes_and_uuids():
+    value = {
+        "at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+    }
+
+    assert json.loads(_json_serializer(value)) == {
+        "at": "2026-01-02T03:04:05+00:00",
+        "id": "12345678-1234-5678-1234-567812345678",
+    }
+
+
+def test_frame_params_round_trip_through_the_json_column():
+    create_tables()
+    params = {"fov": 35, "camera_angle": "low-angle", "color_temp": 3200}
+    db = SessionLocal()
+    try:
+        project = Project(name="JSON test", description="A test scene", genre=Genre.NOIR)
+        db.add(project)
+        db.flush()
+        frame_id = f"frame-{project.id[:8]}"
+        db.add(Frame(
+            id=frame_id,
+            project_id=project.id,
+            sequence_number=1,
+            prompt="A detective in the rain",
+            image_url="/placeholder.svg",
+            params=params,
+        ))
+        db.commit()
+        db.expire_all()
+
+        assert db.get(Frame, frame_id).params == params
+    finally:
+        db.close()
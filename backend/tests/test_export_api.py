@@ -0,0 +1,71 @@
+"""
+Tests for export option validation on the export endpoint.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal, create_tables
+from app.main import app
+from app.models.database import Frame, Project
+from app.models.schemas import Genre
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Routes are registered when the app is built, so no lifespan is needed
+    create_tables()
+    return TestClient(app)
+
+
+@pytest.fixture
+def project_id():
+    db = SessionLocal()
+    try:
+        project = Project(name="Export test", description="A test scene", genre=Genre.NOIR)
+        db.add(project)
+        db.flush()
+        db.add(Frame(
+            id=f"frame-{project.id[:8]}",
+            project_id=project.id,
+            sequence_number=1,
+            prompt="A detective in the rain",
+            image_url="/placeholder.svg",
+            params={"fov": 50},
+        ))
+        db.commit()
+        return project.id
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize(
+    "export_format, options",
+    [
+        ("mp4", {"fps": 0}),
+        ("mp4", {"fps": 61}),
+        ("mp4", {"quality": "ultra"}),
+        ("mp4", {"fps": "fast"}),
+        ("json", {"include_metadata": "maybe"}),
+        ("nuke", {"compress": "please"}),
+    ],
+)
+def test_invalid_export_options_return_422(client, project_id, export_format, options):
+    response = client.post(
+        f"/api/v1/generation/export/{project_id}",
+        json={"format": export_format, "options": options},
+    )
+
+    assert response.status_code == 422
+    assert f"Invalid {export_format} export options" in response.json()["detail"]
+
+
+def test_valid_json_export_options_are_accepted(client, project_id):
+    response = client.post(
+        f"/api/v1/generation/export/{project_id}",
+        json={"format": "json", "options": {"include_metadata": False}},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json()["project"]["id"] == project_id
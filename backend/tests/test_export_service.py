@@ -0,0 +1,64 @@
+"""
+Tests for export helpers.
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+from PIL import Image
+
+from app.services.export_service import ExportService, _fit_filter
+
+
+def _write_png(path, size, color):
+    Image.new("RGB", size, color).save(path, format="PNG")
+    return path
+
+
+def test_exr_zip_stream_round_trip(tmp_path):
+    first = _write_png(tmp_path / "a.png", (32, 18), "red")
+    second = _write_png(tmp_path / "b.png", (32, 18), "blue")
+
+    chunks = list(ExportService()._iter_exr_zip("Chase", 2, [(0, first), (2, second)]))
+
+    # One chunk per frame plus the central directory
+    assert len(chunks) == 3
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["metadata.json", "frame_0001.png", "frame_0003.png"]
+        assert archive.testzip() is None
+
+        metadata = json.loads(archive.read("metadata.json"))
+        assert metadata["project_name"] == "Chase"
+        assert metadata["frame_count"] == 2
+        assert metadata["format"] == "EXR_SEQUENCE"
+
+        assert archive.read("frame_0001.png") == first.read_bytes()
+        assert archive.read("frame_0003.png") == second.read_bytes()
+        assert archive.getinfo("frame_0001.png").compress_type == zipfile.ZIP_STORED
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        # Already 16:9: scaled to fill, no padding
+        ((1280, 720), "scale=1920:1080,pad=1920:1080:0:0,format=yuv420p"),
+        # Square: pillarboxed
+        ((1000, 1000), "scale=1080:1080,pad=1920:1080:420:0,format=yuv420p"),
+        # Tall: pillarboxed, width rounded down to even
+        ((500, 1001), "scale=538:1080,pad=1920:1080:691:0,format=yuv420p"),
+        # Wide: letterboxed, height rounded down to even
+        ((1001, 500), "scale=1920:958,pad=1920:1080:0:61,format=yuv420p"),
+    ],
+)
+def test_fit_filter_letterboxes_to_1080p(size, expected):
+    assert _fit_filter(size) == expected
+
+
+def test_fit_filter_keeps_even_in_bounds_dimensions():
+    for size in [(3, 7), (1919, 1079), (4096, 2), (2, 4096)]:
+        scale = _fit_filter(size).split(",")[0]
+        width, height = map(int, scale[len("scale="):].split(":"))
+        assert width % 2 == 0 and height % 2 == 0
+        assert 2 <= width <= 1920 and 2 <= height <= 1080
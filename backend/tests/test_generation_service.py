@@ -0,0 +1,145 @@
+"""
+Tests for frame refinement in the generation service.
+"""
+
+import asyncio
+
+import pytest
+
+from app.database import SessionLocal, create_tables
+from app.models.database import Frame, Project
+from app.models.schemas import FrameParamsPatch, Genre
+from app.services.bria_client import BriaGenerationResponse
+from app.services import generation_service
+from app.services.generation_service import GenerationService, drain_background_tasks
+
+
+class _RecordingBria:
+    """Stands in for the Bria client and records each refinement it receives."""
+
+    def __init__(self, image_url):
+        self.image_url = image_url
+        self.calls = []
+
+    async def refine_image(self, **kwargs):
+        self.calls.append(kwargs)
+        return BriaGenerationResponse(
+            id=f"refine-{len(self.calls)}",
+            status="completed",
+            image_url=self.image_url,
+        )
+
+
+class _SlowStorage:
+    """Stores every image under /uploads once released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def store_image_from_url(self, image_url, filename):
+        await self.release.wait()
+        return f"/uploads/{filename}.png"
+
+
+@pytest.fixture
+def db():
+    create_tables()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def frame_id(db):
+    project = Project(name="Refine test", description="A test scene", genre=Genre.NOIR)
+    db.add(project)
+    db.flush()
+    frame = Frame(
+        id=f"frame-{project.id[:8]}",
+        project_id=project.id,
+        sequence_number=1,
+        prompt="A detective in the rain",
+        image_url="/placeholder.svg",
+        params={"fov": 75},
+    )
+    db.add(frame)
+    db.commit()
+    return frame.id
+
+
+@pytest.mark.asyncio
+async def test_repeated_refinement_builds_on_the_previous_result(db, frame_id):
+    bria = _RecordingBria("/placeholder.svg")
+    service = GenerationService(bria=bria)
+
+    await service.refine_frame(frame_id, "Add neon signs", db=db)
+    await service.refine_frame(frame_id, "Add neon signs", db=db)
+
+    # Each refinement starts from the frame the previous one produced,
+    # so a repeat is a new request rather than a replay
+    assert len(bria.calls) == 2
+    assert bria.calls[0]["original_prompt"] == "A detective in the rain"
+    assert bria.calls[1]["original_prompt"] == (
+        "A detective in the rain (refined: Add neon signs)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_refined_image_is_persisted_after_the_response(db, frame_id):
+    bria_url = "https://bria.test/refined.png"
+    service = GenerationService(bria=_RecordingBria(bria_url))
+    storage = _SlowStorage()
+    service.storage_service = storage
+
+    result = await service.refine_frame(frame_id, "Add neon signs", db=db)
+
+    # The response carries the Bria URL while the copy is still running
+    assert result["image_url"] == bria_url
+    assert result["metadata"]["persistence_pending"] is True
+    assert db.get(Frame, frame_id).image_url == bria_url
+
+    storage.release.set()
+    await drain_background_tasks(timeout=5)
+
+    db.expire_all()
+    stored_url = db.get(Frame, frame_id).image_url
+    assert stored_url.startswith(f"/uploads/refined_{frame_id}_")
+    assert not generation_service._background_tasks
+
+
+@pytest.mark.asyncio
+async def test_drain_cancels_background_tasks_that_overrun():
+    started = asyncio.Event()
+
+    async def stuck():
+        started.set()
+        await asyncio.Event().wait()
+
+    task = asyncio.create_task(stuck())
+    generation_service._background_tasks.add(task)
+    task.add_done_callback(generation_service._background_tasks.discard)
+    await started.wait()
+
+    await drain_background_tasks(timeout=0.01)
+
+    assert task.cancelled()
+    assert not generation_service._background_tasks
+
+
+@pytest.mark.asyncio
+async def test_refinement_patch_is_merged_over_stored_params(db, frame_id):
+    bria = _RecordingBria("/placeholder.svg")
+    service = GenerationService(bria=bria)
+
+    result = await service.refine_frame(
+        frame_id, "Lower the camera", params=FrameParamsPatch(camera_angle="low-angle"), db=db
+    )
+
+    params = bria.calls[0]["params"]
+    # The stored fov survives; only the patched field changes
+    assert params.fov == 75
+    assert params.camera_angle == "low-angle"
+    assert result["parameters"]["camera_angle"] == "low-angle"
+    assert db.get(Frame, frame_id).params["camera_angle"] == "low-angle"
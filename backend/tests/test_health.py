@@ -0,0 +1,19 @@
+"""
+Tests for the health check endpoint.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_health_check_matches_its_documented_model():
+    client = TestClient(app)
+
+    response = client.get("/health")
+    schema = client.get("/openapi.json").json()
+
+    assert response.status_code == 200
+    assert response.json()["services"]["database"] == "healthy"
+    documented = schema["paths"]["/health"]["get"]["responses"]["200"]["content"]
+    assert documented["application/json"]["schema"] == {"$ref": "#/components/schemas/HealthCheck"}
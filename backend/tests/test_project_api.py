@@ -0,0 +1,23 @@
+"""
+Tests for project lookups by id.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import create_tables
+from app.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    create_tables()
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("project_id", ["not-a-uuid", "1234", "x" * 40])
+def test_malformed_project_id_returns_404(client, project_id):
+    response = client.get(f"/api/v1/generation/projects/{project_id}")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Project not found"
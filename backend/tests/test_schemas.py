@@ -0,0 +1,52 @@
+"""
+Tests for the partial update schemas derived from the create models.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import FrameParamsPatch, FrameUpdate, Genre, SceneProjectUpdate
+
+
+def test_frame_update_accepts_an_empty_patch():
+    update = FrameUpdate.model_validate({})
+
+    assert update.model_dump(exclude_unset=True) == {}
+    assert update.prompt is None and update.params is None and update.notes is None
+
+
+def test_frame_update_keeps_the_create_constraints():
+    update = FrameUpdate.model_validate({"prompt": "  A detective in the rain  "})
+    assert update.model_dump(exclude_unset=True) == {"prompt": "A detective in the rain"}
+
+    with pytest.raises(ValidationError):
+        FrameUpdate.model_validate({"prompt": "short"})
+    with pytest.raises(ValidationError):
+        FrameUpdate.model_validate({"notes": "x" * 501})
+
+
+def test_scene_project_update_only_carries_given_fields():
+    update = SceneProjectUpdate.model_validate({"genre": "noir"})
+
+    assert update.model_dump(exclude_unset=True) == {"genre": Genre.NOIR}
+    with pytest.raises(ValidationError):
+        SceneProjectUpdate.model_validate({"name": ""})
+    with pytest.raises(ValidationError):
+        SceneProjectUpdate.model_validate({"genre": "musical"})
+
+
+def test_frame_params_patch_only_carries_given_fields():
+    patch = FrameParamsPatch.model_validate({"fov": 35, "camera_angle": "low-angle"})
+
+    assert patch.model_dump(exclude_none=True) == {"fov": 35, "camera_angle": "low-angle"}
+    with pytest.raises(ValidationError):
+        FrameParamsPatch.model_validate({"fov": 5})
+    with pytest.raises(ValidationError):
+        FrameParamsPatch.model_validate({"composition": "diagonal"})
+
+
+def test_frame_update_nests_a_params_patch():
+    update = FrameUpdate.model_validate({"params": {"lighting": 80}})
+
+    assert isinstance(update.params, FrameParamsPatch)
+    assert update.model_dump(exclude_unset=True) == {"params": {"lighting": 80}}
@@ -0,0 +1,63 @@
+"""
+Tests for streaming downloaded images into local storage.
+"""
+
+import httpx
+import pytest
+
+from app.services import storage_service
+from app.services.storage_service import StorageService
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 600
+
+
+class _TruncatedStream(httpx.AsyncByteStream):
+    """Sends the first chunk of an image, then drops the connection."""
+
+    async def __aiter__(self):
+        yield IMAGE_BYTES[:1024]
+        raise httpx.ReadError("connection reset")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    def use_transport(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(storage_service, "_download_client", client)
+        return client
+
+    service = StorageService()
+    service.upload_dir = tmp_path
+    return service, use_transport
+
+
+@pytest.mark.asyncio
+async def test_download_is_streamed_to_a_new_upload(storage, tmp_path):
+    service, use_transport = storage
+    client = use_transport(lambda request: httpx.Response(
+        200, content=IMAGE_BYTES, headers={"Content-Type": "image/webp"}
+    ))
+    try:
+        url = await service.store_image_from_url("https://bria.test/a.webp", "frame_1")
+    finally:
+        await client.aclose()
+
+    # The extension follows the response Content-Type
+    assert url.startswith("/uploads/") and url.endswith("/frame_1.webp")
+    stored = tmp_path / url[len("/uploads/"):]
+    assert stored.read_bytes() == IMAGE_BYTES
+
+
+@pytest.mark.asyncio
+async def test_truncated_download_leaves_no_file_behind(storage, tmp_path):
+    service, use_transport = storage
+    client = use_transport(lambda request: httpx.Response(
+        200, stream=_TruncatedStream(), headers={"Content-Type": "image/png"}
+    ))
+    try:
+        url = await service.store_image_from_url("https://bria.test/a.png", "frame_1")
+    finally:
+        await client.aclose()
+
+    assert url == "/placeholder.svg"
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,80 @@
+"""
+Tests for curated surprise suggestions and the Gemini scene pools.
+"""
+
+import itertools
+
+import pytest
+
+from app.core.config import settings
+from app.services import surprise_service
+from app.services.surprise_service import SurpriseService
+
+
+@pytest.mark.parametrize("genre", sorted(SurpriseService.creative_templates))
+@pytest.mark.parametrize("style", sorted(SurpriseService.parameter_styles))
+def test_curated_suggestion_stays_in_style_ranges(genre, style):
+    service = SurpriseService()
+    ranges = SurpriseService.parameter_styles[style]
+    templates = SurpriseService.creative_templates[genre]
+
+    for _ in range(300):
+        suggestion = service._generate_curated_suggestion(genre, style)
+        params = suggestion["suggested_params"]
+
+        assert suggestion["genre"] == genre
+        assert suggestion["scene_description"].startswith(templates)
+        for key, (low, high) in ranges.items():
+            assert low <= params[key] <= high, key
+            assert isinstance(params[key], int)
+        assert params["cameraAngle"] in surprise_service._CURATED_CAMERA_ANGLES
+        assert params["composition"] in surprise_service._CURATED_COMPOSITIONS
+
+
+def test_curated_suggestion_falls_back_for_unknown_genre_and_style():
+    suggestion = SurpriseService()._generate_curated_suggestion("opera", "grainy")
+
+    assert suggestion["scene_description"].startswith(SurpriseService.creative_templates["noir"])
+    for key, (low, high) in SurpriseService.parameter_styles["cinematic"].items():
+        assert low <= suggestion["suggested_params"][key] <= high
+
+
+@pytest.mark.parametrize(
+    "genre, style",
+    [("opera", "cinematic"), ("noir", "grainy"), (["noir"], "cinematic"), ("noir", {"a": 1})],
+)
+def test_scene_pool_ignores_unknown_or_unhashable_keys(monkeypatch, genre, style):
+    monkeypatch.setattr(surprise_service, "_scene_pools", {})
+    scene = {"scene_description": "x", "genre": "noir", "suggested_params": {}}
+
+    surprise_service._pool_scene(genre, style, scene)
+
+    assert surprise_service._pooled_scenes(genre, style, 4) == []
+    assert surprise_service._scene_pools == {}
+
+
+@pytest.mark.asyncio
+async def test_surprise_batch_has_no_duplicate_pooled_scenes(monkeypatch):
+    monkeypatch.setattr(surprise_service, "_scene_pools", {})
+    monkeypatch.setattr(settings, "GOOGLE_API_KEY", "test-key")
+    counter = itertools.count()
+
+    async def fake_gemini(self, genre, style):
+        scene = {
+            "scene_description": f"scene {next(counter)}",
+            "genre": genre,
+            "suggested_params": {"fov": 50},
+        }
+        surprise_service._pool_scene(genre, style, scene)
+        return scene
+
+    monkeypatch.setattr(SurpriseService, "_generate_with_gemini", fake_gemini)
+    service = SurpriseService()
+
+    for _ in range(10):
+        suggestions = await service.generate_creative_scenes(8, "noir", "cinematic")
+        descriptions = [s["scene_description"] for s in suggestions]
+        assert len(descriptions) == 8
+        assert len(set(descriptions)) == 8
+
+    assert list(surprise_service._scene_pools) == [("noir", "cinematic")]